@@ -9,10 +9,26 @@ NO APIs needed - uses pre-compiled lat/lon data for Indian cities/districts.
 """
 
 import json
+import hashlib
 import pandas as pd
 from math import radians, cos, sin, asin, sqrt
 from pathlib import Path
 
+# (location, state, description key) -> _nearest_depot result. Module level, not
+# per scorer: every scorer has the same depot and location tables, and caching
+# on an instance method would keep the scorer alive. Descriptions are keyed by
+# digest so the cache does not hold on to the full text.
+_NEAREST_CACHE = {}
+_NEAREST_CACHE_SIZE = 8192
+
+
+def _desc_key(project_desc):
+    """Short digest of a description; non-strings (NaN, None) are used as is"""
+    if isinstance(project_desc, str):
+        return hashlib.blake2b(project_desc.encode(), digest_size=8).digest()
+    return project_desc
+
+
 class GeographicProximityScorer:
     def __init__(self):
         # HPCL Depot coordinates (manually compiled from Google Maps)
@@ -184,10 +200,8 @@ class GeographicProximityScorer:
         # OPTIONAL: Enable Nominatim for accurate geocoding of unknown locations
         # Uncomment below to use free OpenStreetMap API (1 req/sec rate limit)
         # try:
-        #     from nominatim_geocoder import NominatimGeocoder
-        #     if not hasattr(self, 'nominatim'):
-        #         self.nominatim = NominatimGeocoder()
-        #     coords = self.nominatim.geocode(district_clean, state)
+        #     from nominatim_geocoder import get_nominatim_geocoder
+        #     coords = get_nominatim_geocoder().geocode(district_clean, state)
         #     if coords:
         #         self.location_coords[district_clean] = coords
         #         return coords
@@ -232,14 +246,13 @@ class GeographicProximityScorer:
         - 300-500 km: 0.6 (distant)
         500+ km: 0.5 (very distant)
         """
-        # Geocode lead location
-        lead_coords = self.geocode_location(location, state, project_desc)
+        # Geocode lead location and find distance to nearest depot (memoized)
+        nearest = self._nearest_depot(location, state, project_desc)
         
-        if not lead_coords:
+        if nearest is None:
             return 0.5  # Default for ungeocodable locations
         
-        # Find distance to nearest depot
-        distance = self.find_nearest_depot(lead_coords)
+        _, distance, _ = nearest
         
         # Score based on distance thresholds
         if distance < 50:
@@ -255,8 +268,27 @@ class GeographicProximityScorer:
         else:
             return 0.5
     
-    def get_nearest_depot_info(self, location, state, project_desc=""):
-        """Get detailed info about nearest depot (for transparency)"""
+    def _nearest_depot(self, location, state, project_desc=""):
+        """
+        Geocode a lead and find its nearest depot: (depot, distance_km, lead_coords),
+        or None if the location cannot be geocoded. Leads share locations, and the
+        score and info lookups repeat the same work, so results are memoized per
+        (location, state, description digest).
+        """
+        key = (location, state, _desc_key(project_desc))
+        try:
+            return _NEAREST_CACHE[key]
+        except KeyError:
+            pass
+        
+        nearest = self._find_nearest_depot(location, state, project_desc)
+        if len(_NEAREST_CACHE) >= _NEAREST_CACHE_SIZE:
+            _NEAREST_CACHE.clear()
+        _NEAREST_CACHE[key] = nearest
+        return nearest
+    
+    def _find_nearest_depot(self, location, state, project_desc=""):
+        """Uncached _nearest_depot"""
         lead_coords = self.geocode_location(location, state, project_desc)
         
         if not lead_coords:
@@ -272,6 +304,16 @@ class GeographicProximityScorer:
                 min_distance = distance
                 nearest_depot = depot_name
         
+        return nearest_depot, min_distance, lead_coords
+    
+    def get_nearest_depot_info(self, location, state, project_desc=""):
+        """Get detailed info about nearest depot (for transparency)"""
+        nearest = self._nearest_depot(location, state, project_desc)
+        
+        if nearest is None:
+            return None
+        
+        nearest_depot, min_distance, lead_coords = nearest
         return {
             'nearest_depot': nearest_depot,
             'distance_km': round(min_distance, 1),
@@ -3,7 +3,7 @@ Financial Inference Engine.
 Analyzes corporate filings to estimate fuel consumption impact from capacity changes.
 """
 import re
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 
 class FinancialInferenceEngine:
     """
@@ -31,6 +31,10 @@ class FinancialInferenceEngine:
         r'(?:rs\.?|inr)?\s*(\d+(?:,\d+)*)\s+(?:cr|crore)\s+investment',  # "Rs 1500 Cr investment"
     ]
     
+    # Compiled once per process, shared by every engine
+    _CAPACITY_RES = [re.compile(p, re.IGNORECASE) for p in CAPACITY_PATTERNS]
+    _CAPEX_RES = [re.compile(p, re.IGNORECASE) for p in CAPEX_PATTERNS]
+    
     # Industry-specific fuel consumption baselines
     FUEL_CONSUMPTION_FACTORS = {
         "Steel": {"base_kwh_per_ton": 500, "fuel_intensity": "high"},
@@ -98,12 +102,24 @@ class FinancialInferenceEngine:
         
         return result
     
-    def analyze_rating_rationale(self, text: str) -> Dict[str, Any]:
+    def analyze_rating_rationale(self, rationale: str, company: Optional[str] = None) -> Dict[str, Any]:
         """
         Analyze 'Rating Rationale' text for specific project signals.
-        Maps keywords to fuel/product demand.
+        Maps keywords to fuel/product demand. Only the rationale is scanned;
+        the company name is consulted only when the rationale has no signal.
         """
-        text_lower = text.lower()
+        signals, loan_purpose = self._rationale_signals(rationale.lower())
+        if not signals and company:
+            signals, loan_purpose = self._rationale_signals(company.lower())
+        
+        return {
+            "fuel_signals": signals,
+            "loan_purpose": loan_purpose
+        }
+    
+    @staticmethod
+    def _rationale_signals(text_lower: str) -> Tuple[List[Dict[str, str]], str]:
+        """Fuel signals and loan purpose found in lower-cased rationale text."""
         signals = []
         loan_purpose = "General Corporate Purposes"
         
@@ -142,16 +158,22 @@ class FinancialInferenceEngine:
                 "reason": "Spinning mills require constant lubrication and heating"
             })
             
-        return {
-            "fuel_signals": signals,
-            "loan_purpose": loan_purpose
-        }
+        return signals, loan_purpose
     
-    def analyze_objects_clause(self, text: str, capital_cr: float) -> Dict[str, Any]:
+    def analyze_objects_clause(self, text: str, capital_cr: float, company: Optional[str] = None) -> Dict[str, Any]:
         """
         Infer business needs from 'Main Objects' clause.
+        Only the clause is scanned; the company name is consulted only when
+        the clause matches no sector.
         """
-        text = text.lower()
+        result = self._objects_needs(text.lower())
+        if result["product_match"] is None and company:
+            result = self._objects_needs(company.lower())
+        return result
+    
+    @staticmethod
+    def _objects_needs(text: str) -> Dict[str, Any]:
+        """Sector, product and needs implied by lower-cased objects text."""
         result = {
             "product_match": None,
             "sector": "General",
@@ -188,8 +210,8 @@ class FinancialInferenceEngine:
         """Extract capacity increase percentage from text."""
         text_lower = text.lower()
         
-        for pattern in self.CAPACITY_PATTERNS:
-            match = re.search(pattern, text_lower, re.IGNORECASE)
+        for regex in self._CAPACITY_RES:
+            match = regex.search(text_lower)
             if match:
                 try:
                     pct = float(match.group(1))
@@ -204,8 +226,8 @@ class FinancialInferenceEngine:
         """Extract CAPEX amount in Crores."""
         text_lower = text.lower()
         
-        for pattern in self.CAPEX_PATTERNS:
-            match = re.search(pattern, text_lower, re.IGNORECASE)
+        for regex in self._CAPEX_RES:
+            match = regex.search(text_lower)
             if match:
                 try:
                     capex_str = match.group(1).replace(',', '')
@@ -231,3 +253,13 @@ class FinancialInferenceEngine:
             base_estimate *= 1.3  # Less capital-intensive
         
         return min(base_estimate, 100)  # Cap at 100%
+
+
+# Singleton
+_financial_engine_instance = None
+
+def get_financial_engine() -> FinancialInferenceEngine:
+    global _financial_engine_instance
+    if _financial_engine_instance is None:
+        _financial_engine_instance = FinancialInferenceEngine()
+    return _financial_engine_instance
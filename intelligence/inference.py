@@ -8,6 +8,9 @@ from typing import List, Dict, Tuple, Any
 
 from config.settings import PRODUCT_MAP
 
+# Stands in for "no product found" so consumers never have to guard missing keys
+UNKNOWN_PRODUCT = {"product": "Unknown", "confidence": 0, "reason": ""}
+
 class ProductInferenceEngine:
     
     # Use centralized configuration
@@ -17,6 +20,16 @@ class ProductInferenceEngine:
     SCORE_DIRECT = 95
     SCORE_INFERRED = 60
     
+    # Lower-cased once for every engine: (product, product_lower, ((keyword, keyword_lower), ...))
+    _LOWER_MAPPING = tuple(
+        (product, product.lower(), tuple((kw, kw.lower()) for kw in keywords))
+        for product, keywords in KEYWORD_MAPPING.items()
+    )
+    
+    # Context rules, compiled once
+    _INTENT_RE = re.compile(r"(looking for|requirement|urgent|buy|purchase)", re.IGNORECASE)
+    _GROWTH_RE = re.compile(r"(expansion|new project|setting up|commissioned)", re.IGNORECASE)
+    
     def infer_products(self, text: str) -> List[Dict[str, Any]]:
         """
         Analyze text to find product opportunities with confidence scores.
@@ -25,9 +38,9 @@ class ProductInferenceEngine:
         results = []
         text_lower = text.lower()
         
-        for product, keywords in self.KEYWORD_MAPPING.items():
+        for product, product_lower, keywords in self._LOWER_MAPPING:
             # Check for direct product mention (e.g. "Furnace Oil")
-            if product.lower() in text_lower:
+            if product_lower in text_lower:
                 results.append({
                     "product": product,
                     "confidence": self.SCORE_DIRECT,
@@ -36,8 +49,8 @@ class ProductInferenceEngine:
                 continue
                 
             # Check for inferred keywords
-            for keyword in keywords:
-                if keyword.lower() in text_lower:
+            for keyword, keyword_lower in keywords:
+                if keyword_lower in text_lower:
                     results.append({
                         "product": product,
                         "confidence": self.SCORE_INFERRED,
@@ -50,18 +63,19 @@ class ProductInferenceEngine:
     def analyze_signal(self, text: str) -> Dict[str, Any]:
         """
         Full analysis of a text signal.
+        "products" is never empty: with no match it holds only UNKNOWN_PRODUCT.
         """
-        products = self.infer_products(text)
+        products = self.infer_products(text) or [UNKNOWN_PRODUCT]
         
         # Contextual analysis (mock NLP for now using regex rules)
         context = "General"
-        if re.search(r"(looking for|requirement|urgent|buy|purchase)", text, re.IGNORECASE):
+        if self._INTENT_RE.search(text):
             context = "High Intent (Buying)"
-        elif re.search(r"(expansion|new project|setting up|commissioned)", text, re.IGNORECASE):
+        elif self._GROWTH_RE.search(text):
             context = "Growth Signal (Expansion)"
             
         return {
             "products": products,
             "context": context,
-            "primary_product": products[0]['product'] if products else None
+            "primary_product": None if products[0] is UNKNOWN_PRODUCT else products[0]["product"]
         }
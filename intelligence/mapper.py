@@ -3,11 +3,11 @@ Product-to-Industry Mapper - Maps signals to petroleum products.
 """
 
 import logging
+from collections import Counter, OrderedDict
 from typing import Dict, List, Any, Set
 
-import sys
-sys.path.append(str(__file__).rsplit('\\', 2)[0])
 from config.settings import PRODUCT_MAP, KEYWORDS
+from intelligence.keyword_index import KeywordIndex
 
 logger = logging.getLogger(__name__)
 
@@ -27,27 +27,32 @@ class ProductMapper:
         "Manufacturing": ["Boiler", "Heater", "Industrial"],
     }
     
+    # SECTOR_MAP indicators, lower-cased and indexed once
+    _SECTOR_INDEX = KeywordIndex(SECTOR_MAP)
+    
+    # Max distinct (text, keywords) inputs remembered by enrich_batch
+    ENRICH_CACHE_SIZE = 8192
+    
     def __init__(self):
         self.product_map = PRODUCT_MAP
+        # product_map indicators, lower-cased and indexed once
+        self._product_index = KeywordIndex(self.product_map)
+        self._enrich_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
     
     def infer_products(self, text: str, keywords_matched: Dict[str, List[str]] = None) -> List[str]:
         """
         Infer likely petroleum products from text and/or matched keywords.
-        Returns list of product names in order of likelihood.
+        Returns the top 3 product names in order of likelihood.
         """
-        products: Dict[str, int] = {}  # product -> confidence score
-        
-        # Build search text
-        search_text = text.lower()
-        if keywords_matched:
-            for kw_list in keywords_matched.values():
-                search_text += " " + " ".join(kw_list).lower()
+        return self._infer_products(self._search_text(text, keywords_matched), keywords_matched)
+    
+    def _infer_products(self, search_text: str, keywords_matched: Dict[str, List[str]] = None) -> List[str]:
+        """infer_products() on a search text built by _search_text()."""
+        products: Counter = Counter()  # product -> confidence score
         
-        # Match against product indicators
-        for product, indicators in self.product_map.items():
-            for indicator in indicators:
-                if indicator.lower() in search_text:
-                    products[product] = products.get(product, 0) + 1
+        # Match against product indicators (one point per indicator found)
+        for product, indicators in self._product_index.match_lower(search_text).items():
+            products[product] += len(indicators)
         
         # Direct commodity keyword matches are strongest signals
         if keywords_matched:
@@ -55,34 +60,30 @@ class ProductMapper:
             for keyword in commodity_keywords:
                 kw_lower = keyword.lower()
                 if "bitumen" in kw_lower or "vg-" in kw_lower or "dbm" in kw_lower:
-                    products["Bitumen"] = products.get("Bitumen", 0) + 5
+                    products["Bitumen"] += 5
                 elif "furnace oil" in kw_lower or "fo" in kw_lower or "lshs" in kw_lower:
-                    products["Furnace Oil"] = products.get("Furnace Oil", 0) + 5
-                    products["LSHS"] = products.get("LSHS", 0) + 3
+                    products["Furnace Oil"] += 5
+                    products["LSHS"] += 3
                 elif "hsd" in kw_lower or "diesel" in kw_lower:
-                    products["HSD"] = products.get("HSD", 0) + 5
+                    products["HSD"] += 5
                 elif "solvent" in kw_lower or "hexane" in kw_lower or "mto" in kw_lower:
-                    products["Solvents"] = products.get("Solvents", 0) + 5
+                    products["Solvents"] += 5
                 elif "base oil" in kw_lower:
-                    products["Base Oil"] = products.get("Base Oil", 0) + 5
+                    products["Base Oil"] += 5
         
-        # Sort by confidence and return
-        sorted_products = sorted(products.items(), key=lambda x: x[1], reverse=True)
-        return [p[0] for p in sorted_products]
+        # Top 3 by confidence (most_common uses a bounded heap, not a full sort)
+        return [p for p, _ in products.most_common(3)]
     
     def infer_sector(self, text: str, keywords_matched: Dict[str, List[str]] = None) -> str:
         """Infer the industry sector from text and keywords."""
-        search_text = text.lower()
-        if keywords_matched:
-            for kw_list in keywords_matched.values():
-                search_text += " " + " ".join(kw_list).lower()
-        
-        sector_scores: Dict[str, int] = {}
-        
-        for sector, indicators in self.SECTOR_MAP.items():
-            for indicator in indicators:
-                if indicator.lower() in search_text:
-                    sector_scores[sector] = sector_scores.get(sector, 0) + 1
+        return self._infer_sector(self._search_text(text, keywords_matched))
+    
+    def _infer_sector(self, search_text: str) -> str:
+        """infer_sector() on a search text built by _search_text()."""
+        sector_scores = {
+            sector: len(indicators)
+            for sector, indicators in self._SECTOR_INDEX.match_lower(search_text).items()
+        }
         
         if sector_scores:
             return max(sector_scores.items(), key=lambda x: x[1])[0]
@@ -92,32 +93,90 @@ class ProductMapper:
         """
         Enrich a lead with inferred product and sector information.
         """
-        # Get text content for analysis
-        text = ""
-        if lead.get("raw_data"):
-            raw = lead["raw_data"]
-            if isinstance(raw, dict):
-                text = " ".join(str(v) for v in raw.values())
-            else:
-                text = str(raw)
-        text += " " + lead.get("company_name", "")
-        
+        text = self._lead_text(lead)
         keywords_matched = lead.get("keywords_matched", {})
+        search_text = self._search_text(text, keywords_matched)
         
         # Infer products
-        products = self.infer_products(text, keywords_matched)
+        products = self._infer_products(search_text, keywords_matched)
         if products:
             lead["product_match"] = ", ".join(products[:3])  # Top 3
         
         # Infer sector
         if not lead.get("sector"):
-            lead["sector"] = self.infer_sector(text, keywords_matched)
+            lead["sector"] = self._infer_sector(search_text)
         
         return lead
     
     def enrich_batch(self, leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Enrich multiple leads."""
-        return [self.enrich_lead(lead) for lead in leads]
+        """
+        Enrich multiple leads.
+        Template descriptions repeat across sources, so results are memoized
+        on the analysed text + matched keywords (LRU, ENRICH_CACHE_SIZE entries).
+        """
+        cache = self._enrich_cache
+        enriched = []
+        
+        for lead in leads:
+            text = self._lead_text(lead)
+            keywords_matched = lead.get("keywords_matched", {})
+            key = (text, self._keywords_key(keywords_matched))
+            
+            cached = cache.get(key)
+            if cached is None:
+                # One search text for both products and sector
+                search_text = self._search_text(text, keywords_matched)
+                products = self._infer_products(search_text, keywords_matched)
+                cached = (
+                    ", ".join(products[:3]) if products else None,
+                    self._infer_sector(search_text),
+                )
+                cache[key] = cached
+                if len(cache) > self.ENRICH_CACHE_SIZE:
+                    cache.popitem(last=False)
+            else:
+                cache.move_to_end(key)
+            
+            product_match, sector = cached
+            if product_match:
+                lead["product_match"] = product_match
+            if not lead.get("sector"):
+                lead["sector"] = sector
+            enriched.append(lead)
+        
+        return enriched
+    
+    def _lead_text(self, lead: Dict[str, Any]) -> str:
+        """Get text content of a lead for analysis."""
+        text = ""
+        if lead.get("raw_data"):
+            raw = lead["raw_data"]
+            if isinstance(raw, dict):
+                # Skip str() for values that already are strings
+                parts = []
+                append = parts.append
+                for v in raw.values():
+                    append(v if type(v) is str else str(v))
+                text = " ".join(parts)
+            else:
+                text = str(raw)
+        return text + " " + lead.get("company_name", "")
+    
+    @staticmethod
+    def _search_text(text: str, keywords_matched: Dict[str, List[str]] = None) -> str:
+        """Lower-cased text plus matched keywords, as scanned for indicators."""
+        search_text = text.lower()
+        if keywords_matched:
+            for kw_list in keywords_matched.values():
+                search_text += " " + " ".join(kw_list).lower()
+        return search_text
+    
+    @staticmethod
+    def _keywords_key(keywords_matched: Dict[str, List[str]]) -> tuple:
+        """Hashable form of a keywords_matched dict."""
+        if not keywords_matched:
+            return ()
+        return tuple((category, tuple(kws)) for category, kws in keywords_matched.items())
 
 
 # Singleton
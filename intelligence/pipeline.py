@@ -2,21 +2,35 @@
 Central Intelligence Pipeline.
 Orchestrates Inference, Routing, and Scoring for all incoming leads.
 """
-from typing import Dict, Any
-from intelligence.inference import ProductInferenceEngine
+import re
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable
+from intelligence.inference import ProductInferenceEngine, UNKNOWN_PRODUCT
 from intelligence.routing import GeospatialRouter
-from intelligence.scorer import LeadScorer
+from intelligence.scorer import get_scorer
 from intelligence.entity_resolution import CompanyNormalizer
-from intelligence.financial_inference import FinancialInferenceEngine
+from intelligence.financial_inference import get_financial_engine
+
+# Authorized capital in descriptions, e.g. "₹50.0 Cr" (also tolerates mis-decoded "â‚¹" and "Rs.")
+_CAPITAL_RE = re.compile(r'(?:₹|â‚¹|Rs\.?\s*)(\d+(?:\.\d+)?)\s*Cr', re.IGNORECASE)
 
 class IntelligencePipeline:
     
     def __init__(self):
         self.inference = ProductInferenceEngine()
         self.router = GeospatialRouter()
-        self.scorer = LeadScorer()
+        self.scorer = get_scorer()
         self.normalizer = CompanyNormalizer()
-        self.financial_engine = FinancialInferenceEngine()
+        self.financial_engine = get_financial_engine()
+        
+        # Signal-specific analysis steps (signal_type -> handler)
+        self.signal_handlers = {
+            "Financial Announcement": self._analyze_financial,
+            "Capacity Expansion": self._analyze_financial,
+            "Credit Rating Rationale": self._analyze_rating_rationale,
+            "New Company Registration": self._analyze_registration,
+        }
         
     def process_lead(self, lead_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -27,6 +41,44 @@ class IntelligencePipeline:
         - Geospatial Routing (territory, sales_officer)
         - Advanced Scoring (score)
         """
+        handler = self.signal_handlers.get(lead_data.get("signal_type", ""))
+        return self._process(lead_data, handler)
+    
+    def process_batch(self, leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Enrich many leads at once.
+        Leads are grouped by signal_type so the signal-specific handler is
+        resolved once per group. Leads are enriched in place and returned
+        in their original order.
+        """
+        buckets = defaultdict(list)
+        for lead in leads:
+            buckets[lead.get("signal_type", "")].append(lead)
+        
+        # Enrich everything first, then score the leads that need it in one pass
+        to_score = []
+        for signal_type, bucket in buckets.items():
+            handler = self.signal_handlers.get(signal_type)
+            for lead in bucket:
+                if self._enrich(lead, handler):
+                    to_score.append(lead)
+        
+        for lead, score in zip(to_score, self.scorer.score_batch(to_score)):
+            lead["score"] = score
+        
+        return leads
+    
+    def _process(self, lead_data: Dict[str, Any], handler: Optional[Callable]) -> Dict[str, Any]:
+        """Run the full enrichment and scoring for one lead with a pre-resolved signal handler."""
+        if self._enrich(lead_data, handler):
+            lead_data["score"] = self.scorer.score_lead(lead_data)
+        return lead_data
+    
+    def _enrich(self, lead_data: Dict[str, Any], handler: Optional[Callable]) -> bool:
+        """
+        Everything but the score, in place. Returns False if the lead has no
+        text to analyze (it is left unscored).
+        """
         # 0. Entity Resolution
         raw_name = lead_data.get("company_name", "")
         lead_data["company_name"] = self.normalizer.normalize(raw_name)
@@ -37,81 +89,22 @@ class IntelligencePipeline:
         full_text = f"{description} {raw_desc}".strip()
         
         if not full_text:
-            return lead_data
+            return False
             
         # 1. Product Inference
         inf_result = self.inference.analyze_signal(full_text)
-        products = inf_result.get("products", [])
+        # Take the highest confidence product
+        primary = inf_result["products"][0]
         
-        if products:
-            # Take the highest confidence product
-            primary = products[0]
+        if primary is not UNKNOWN_PRODUCT:
             lead_data["product_match"] = primary["product"]
             lead_data["confidence"] = primary["confidence"]
         else:
             lead_data["confidence"] = 0.0
         
-        # 1.5. Financial Inference (for capacity expansion signals)
-        signal_type = lead_data.get("signal_type", "")
-        sector = lead_data.get("sector", "Manufacturing")
-        
-        if signal_type in ["Financial Announcement", "Capacity Expansion"]:
-            financial_data = self.financial_engine.analyze_financial_signal(full_text, sector)
-            
-            # Store financial metadata in raw_data
-            if "raw_data" not in lead_data:
-                lead_data["raw_data"] = {}
-            
-            lead_data["raw_data"]["capacity_increase_pct"] = financial_data.get("capacity_increase_pct", 0)
-            lead_data["raw_data"]["capex_cr"] = financial_data.get("capex_cr", 0)
-            lead_data["raw_data"]["fuel_impact"] = financial_data.get("fuel_impact", "Unknown")
-            lead_data["raw_data"]["estimated_fuel_increase_pct"] = financial_data.get("estimated_fuel_increase_pct", 0)
-            
-            # Boost confidence if financial data found
-            if financial_data.get("capacity_increase_pct", 0) > 0:
-                # Use financial confidence if higher
-                lead_data["confidence"] = max(lead_data.get("confidence", 0), financial_data.get("confidence", 0))
-
-        # 1.6. Credit Rating Rationale Analysis
-        if signal_type == "Credit Rating Rationale":
-            rating_analysis = self.financial_engine.analyze_rating_rationale(full_text)
-            
-            if "raw_data" not in lead_data: 
-                lead_data["raw_data"] = {}
-                
-            lead_data["raw_data"]["loan_purpose"] = rating_analysis.get("loan_purpose", "General")
-            lead_data["raw_data"]["fuel_signals"] = rating_analysis.get("fuel_signals", [])
-            
-            # If we found specific fuel signals, override product match and boost confidence
-            if rating_analysis.get("fuel_signals"):
-                primary_signal = rating_analysis["fuel_signals"][0]
-                lead_data["product_match"] = primary_signal["product"]
-                lead_data["confidence"] = 90.0  # Very high confidence for Rating Rationales
-
-        # 1.7. New Company Registration Analysis
-        if signal_type == "New Company Registration":
-            # Extract capital from raw_data or description if not present
-            capital = lead_data.get("raw_data", {}).get("authorized_capital_cr", 0.0)
-            if capital == 0.0:
-                # Try to extract from description
-                import re
-                cap_match = re.search(r'₹(\d+\.?\d*) Cr', lead_data.get("description", ""))
-                if cap_match:
-                    capital = float(cap_match.group(1))
-            
-            # Analyze Objects Clause
-            objects_analysis = self.financial_engine.analyze_objects_clause(full_text, capital)
-            
-            if "raw_data" not in lead_data:
-                lead_data["raw_data"] = {}
-            
-            lead_data["raw_data"]["authorized_capital_cr"] = capital
-            lead_data["raw_data"]["inferred_needs"] = objects_analysis.get("inferred_needs", [])
-            
-            if objects_analysis.get("product_match"):
-                lead_data["product_match"] = objects_analysis["product_match"]
-                lead_data["confidence"] = 75.0  # Good signal but early stage
-
+        # 1.5 - 1.7. Signal-specific analysis
+        if handler is not None:
+            handler(lead_data, full_text)
             
         # 2. Geospatial Routing
         # Check if lat/lon is available in raw_data, otherwise infer
@@ -119,16 +112,80 @@ class IntelligencePipeline:
         lon = lead_data.get("raw_data", {}).get("lon")
         
         route_info = self.router.route_lead(full_text, lat, lon)
-        lead_data["territory"] = route_info.get("territory")
-        lead_data["sales_officer"] = route_info.get("sales_officer_id")
+        lead_data["territory"] = route_info["territory"]
+        lead_data["sales_officer"] = route_info["sales_officer_id"]
         
         # 3. Validation & Scoring
         # Ensure discovered_at is present for recency score
         if "discovered_at" not in lead_data:
-            from datetime import datetime
             lead_data["discovered_at"] = datetime.now()
+        
+        return True
+    
+    def _analyze_financial(self, lead_data: Dict[str, Any], full_text: str):
+        """1.5. Financial Inference (for capacity expansion signals)"""
+        sector = lead_data.get("sector", "Manufacturing")
+        financial_data = self.financial_engine.analyze_financial_signal(full_text, sector)
+        
+        # Store financial metadata in raw_data
+        if "raw_data" not in lead_data:
+            lead_data["raw_data"] = {}
+        
+        lead_data["raw_data"]["capacity_increase_pct"] = financial_data.get("capacity_increase_pct", 0)
+        lead_data["raw_data"]["capex_cr"] = financial_data.get("capex_cr", 0)
+        lead_data["raw_data"]["fuel_impact"] = financial_data.get("fuel_impact", "Unknown")
+        lead_data["raw_data"]["estimated_fuel_increase_pct"] = financial_data.get("estimated_fuel_increase_pct", 0)
+        
+        # Boost confidence if financial data found
+        if financial_data.get("capacity_increase_pct", 0) > 0:
+            # Use financial confidence if higher
+            lead_data["confidence"] = max(lead_data.get("confidence", 0), financial_data.get("confidence", 0))
+    
+    def _analyze_rating_rationale(self, lead_data: Dict[str, Any], full_text: str):
+        """1.6. Credit Rating Rationale Analysis"""
+        rating_analysis = self.financial_engine.analyze_rating_rationale(full_text)
+        
+        if "raw_data" not in lead_data: 
+            lead_data["raw_data"] = {}
             
-        score = self.scorer.score_lead(lead_data)
-        lead_data["score"] = score
+        lead_data["raw_data"]["loan_purpose"] = rating_analysis.get("loan_purpose", "General")
+        lead_data["raw_data"]["fuel_signals"] = rating_analysis.get("fuel_signals", [])
         
-        return lead_data
+        # If we found specific fuel signals, override product match and boost confidence
+        if rating_analysis.get("fuel_signals"):
+            primary_signal = rating_analysis["fuel_signals"][0]
+            lead_data["product_match"] = primary_signal["product"]
+            lead_data["confidence"] = 90.0  # Very high confidence for Rating Rationales
+    
+    def _analyze_registration(self, lead_data: Dict[str, Any], full_text: str):
+        """1.7. New Company Registration Analysis"""
+        # Extract capital from raw_data or description if not present
+        capital = lead_data.get("raw_data", {}).get("authorized_capital_cr", 0.0)
+        if capital == 0.0:
+            # Try to extract from description
+            cap_match = _CAPITAL_RE.search(lead_data.get("description", ""))
+            if cap_match:
+                capital = float(cap_match.group(1))
+        
+        # Analyze Objects Clause
+        objects_analysis = self.financial_engine.analyze_objects_clause(full_text, capital)
+        
+        if "raw_data" not in lead_data:
+            lead_data["raw_data"] = {}
+        
+        lead_data["raw_data"]["authorized_capital_cr"] = capital
+        lead_data["raw_data"]["inferred_needs"] = objects_analysis.get("inferred_needs", [])
+        
+        if objects_analysis.get("product_match"):
+            lead_data["product_match"] = objects_analysis["product_match"]
+            lead_data["confidence"] = 75.0  # Good signal but early stage
+
+
+# Singleton
+_pipeline_instance = None
+
+def get_pipeline() -> IntelligencePipeline:
+    global _pipeline_instance
+    if _pipeline_instance is None:
+        _pipeline_instance = IntelligencePipeline()
+    return _pipeline_instance
@@ -28,11 +28,15 @@ class GeospatialRouter:
         "Odisha": (20.95, 85.09),
         "Punjab": (31.14, 75.34),
     }
+    
+    # (state_lower, coords), lower-cased once
+    _STATE_KEYS = tuple((state.lower(), coords) for state, coords in STATE_COORDS.items())
 
     def infer_location(self, text: str) -> Optional[Tuple[float, float]]:
         """Extract approximate lat/lon from text based on state names."""
-        for state, coords in self.STATE_COORDS.items():
-            if state.lower() in text.lower():
+        text_lower = text.lower()
+        for state_lower, coords in self._STATE_KEYS:
+            if state_lower in text_lower:
                 return coords
         return None
 
@@ -40,13 +44,14 @@ class GeospatialRouter:
         """
         Route lead to a territory.
         Priority: Provided Lat/Lon > Inferred Loation > Unassigned
+        Always returns territory, coordinates and sales_officer_id (None when unrouted).
         """
         if lat is None or lon is None:
             coords = self.infer_location(lead_text)
             if coords:
                 lat, lon = coords
             else:
-                return {"territory": "Unassigned", "coordinates": None}
+                return {"territory": "Unassigned", "coordinates": None, "sales_officer_id": None}
         
         point = Point(lon, lat)
         
@@ -58,4 +63,4 @@ class GeospatialRouter:
                     "sales_officer_id": f"SO_{territory_name.split()[0].upper()}_01"
                 }
                 
-        return {"territory": "Out of Territory", "coordinates": (lat, lon)}
+        return {"territory": "Out of Territory", "coordinates": (lat, lon), "sales_officer_id": None}
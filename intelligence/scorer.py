@@ -6,8 +6,8 @@ import logging
 from datetime import datetime
 from typing import Dict, Any, List
 
-import sys
-sys.path.append(str(__file__).rsplit('\\', 2)[0])
+import numpy as np
+
 from config.settings import SCORING
 
 logger = logging.getLogger(__name__)
@@ -30,6 +30,10 @@ class LeadScorer:
         "General": 30
     }
     
+    # Company size / opportunity value terms
+    HIGH_VALUE_TERMS = ("mega project", "crores", "500mw", "1000kva", "refinery", "steel plant", "highway", "greenfield")
+    MEDIUM_VALUE_TERMS = ("expansion", "modernization", "new unit", "boilers", "capacity")
+    
     def __init__(self):
         self.recency_decay = SCORING["recency_decay"]
     
@@ -54,15 +58,27 @@ class LeadScorer:
         
         return min(100, round(total_score, 1))
     
+    def score_batch(self, leads: List[Dict[str, Any]]) -> List[float]:
+        """
+        Score many leads at once: the three component scores are gathered
+        into arrays and weighted in one NumPy pass. Same results as score_lead.
+        """
+        intent = np.array([self.INTENT_SCORES.get(lead.get("signal_type"), 30) for lead in leads], dtype=float)
+        size = np.array([self._infer_size_score(lead) for lead in leads], dtype=float)
+        recency = np.array([self._score_recency(lead.get("discovered_at")) for lead in leads], dtype=float)
+        
+        total = (self.W_INTENT * intent) + (self.W_SIZE * size) + (self.W_RECENCY * recency)
+        return [min(100, round(score, 1)) for score in total.tolist()]
+    
     def _infer_size_score(self, lead: Dict[str, Any]) -> float:
         """Infer company size/opportunity value from text signals."""
         text = str(lead.get("raw_data", "")).lower() + " " + lead.get("description", "").lower()
         
         # High value keywords
-        if any(w in text for w in ["mega project", "crores", "500mw", "1000kva", "refinery", "steel plant", "highway", "greenfield"]):
+        if any(w in text for w in self.HIGH_VALUE_TERMS):
             return 90
         # Medium value
-        if any(w in text for w in ["expansion", "modernization", "new unit", "boilers", "capacity"]):
+        if any(w in text for w in self.MEDIUM_VALUE_TERMS):
             return 60
         # Default
         return 40
@@ -18,7 +18,7 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from config.settings import LOG_LEVEL, LOG_FORMAT
 from models.database import get_db
-from scrapers import SCRAPER_REGISTRY
+from scrapers import SCRAPER_REGISTRY, iter_scraped_batches
 from intelligence.scorer import get_scorer
 from intelligence.mapper import get_mapper
 
@@ -28,6 +28,9 @@ logger = logging.getLogger(__name__)
 
 console = Console()
 
+# Scraped signals are enriched and inserted in batches of this size
+SCRAPE_BATCH_SIZE = 500
+
 
 @click.group()
 @click.version_option(version="1.0.0", prog_name="Petroleum Intel")
@@ -46,11 +49,8 @@ def cli():
 def scrape(source: str, dry_run: bool):
     """🔍 Run scrapers to collect new leads."""
     
-    # db = get_db()
-    # pipeline = IntelligencePipeline()
-    
-    from intelligence.pipeline import IntelligencePipeline
-    pipeline = IntelligencePipeline()
+    from intelligence.pipeline import get_pipeline
+    pipeline = get_pipeline()
     db = get_db()
     
     sources = list(SCRAPER_REGISTRY.keys()) if source == 'all' else [source]
@@ -63,37 +63,49 @@ def scrape(source: str, dry_run: bool):
         console=console,
     ) as progress:
         
-        for src in sources:
-            task = progress.add_task(f"Scraping {src}...", total=None)
+        # Scrapers run concurrently on worker threads; their batches are
+        # enriched and inserted here as they arrive
+        tasks = {src: progress.add_task(f"Scraping {src}...", total=None) for src in sources}
+        counts = {src: {"found": 0, "inserted": 0, "duplicates": 0} for src in sources}
+        failed = set()
+        
+        for src, batch, error in iter_scraped_batches(sources, SCRAPE_BATCH_SIZE):
+            if src in failed:
+                continue
             
-            try:
-                # Create and run scraper
-                scraper_factory = SCRAPER_REGISTRY[src]
-                scraper = scraper_factory()
-                
-                signals = scraper.run()
-                
-                if signals:
-                    processed_signals = [pipeline.process_lead(s) for s in signals]
+            if batch is not None:
+                try:
+                    processed_signals = pipeline.process_batch(batch)
+                    counts[src]["found"] += len(batch)
                     
                     if not dry_run:
                         result = db.insert_leads_batch(processed_signals)
-                        console.print(
-                            f"  ✅ {src}: {result['inserted']} new, "
-                            f"{result['duplicates']} duplicates"
-                        )
-                        total_leads += result['inserted']
-                    else:
-                        console.print(f"  🔍 {src}: {len(signals)} signals (dry run)")
-                        total_leads += len(signals)
-                else:
-                    console.print(f"  ⚠️ {src}: No signals found")
-                    
-            except Exception as e:
-                console.print(f"  ❌ {src}: {e}", style="red")
-                logger.error(f"Scraper {src} failed: {e}", exc_info=True)
+                        counts[src]["inserted"] += result['inserted']
+                        counts[src]["duplicates"] += result['duplicates']
+                except Exception as e:
+                    failed.add(src)
+                    progress.remove_task(tasks[src])
+                    console.print(f"  ❌ {src}: {e}", style="red")
+                    logger.error(f"Scraper {src} failed: {e}", exc_info=True)
+                continue
+            
+            # Source finished (or failed while scraping)
+            progress.remove_task(tasks[src])
+            found = counts[src]["found"]
             
-            progress.remove_task(task)
+            if error is not None:
+                console.print(f"  ❌ {src}: {error}", style="red")
+            elif not found:
+                console.print(f"  ⚠️ {src}: No signals found")
+            elif not dry_run:
+                console.print(
+                    f"  ✅ {src}: {counts[src]['inserted']} new, "
+                    f"{counts[src]['duplicates']} duplicates"
+                )
+                total_leads += counts[src]["inserted"]
+            else:
+                console.print(f"  🔍 {src}: {found} signals (dry run)")
+                total_leads += found
     
     console.print(f"\n🎯 Total: {total_leads} leads collected", style="bold green")
 
@@ -106,7 +118,10 @@ def leads(limit: int, product: str, min_score: float):
     """📋 View collected leads."""
     
     db = get_db()
-    leads_data = db.get_leads(product=product, min_score=min_score, limit=limit)
+    leads_data = db.get_leads(
+        product=product, min_score=min_score, limit=limit,
+        columns=("score", "company_name", "signal_type", "product_match", "sector", "source"),
+    )
     
     if not leads_data:
         console.print("No leads found.", style="yellow")
@@ -121,9 +136,7 @@ def leads(limit: int, product: str, min_score: float):
     table.add_column("Sector", style="magenta")
     table.add_column("Source", style="blue")
     
-    for lead in leads_data:
-        score = lead.get('score', 0)
-        
+    for score, company_name, signal_type, product_match, sector, source in leads_data:
         # Color-code score
         if score >= 80:
             score_str = f"[bold red]{score:.0f}[/]"
@@ -134,11 +147,11 @@ def leads(limit: int, product: str, min_score: float):
         
         table.add_row(
             score_str,
-            lead.get('company_name', 'Unknown')[:30],
-            lead.get('signal_type', ''),
-            lead.get('product_match', '-')[:15] if lead.get('product_match') else '-',
-            lead.get('sector', '-'),
-            lead.get('source', ''),
+            company_name[:30],
+            signal_type,
+            product_match[:15] if product_match else '-',
+            sector,
+            source,
         )
     
     console.print(table)
@@ -194,67 +207,69 @@ def serve(host: str, port: int, debug: bool):
 @click.option('--min-confidence', default=30.0, help='Minimum confidence score filter')
 def export(format: str, output: str, min_confidence: float):
     """💾 Export leads to file."""
+    export_leads(format=format, output=output, min_confidence=min_confidence)
+
+
+def export_leads(format: str = 'csv', output: str = 'leads_export', min_confidence: float = 30.0):
+    """Export leads to data/<output>.<format> (callable without the CLI)"""
     import json
     import csv
+    from itertools import chain
     
     db = get_db()
-    leads_data = db.get_leads(limit=10000)  # Export all
     
-    # Filter by confidence
-    original_count = len(leads_data)
-    leads_data = [l for l in leads_data if l.get("confidence", 0) >= min_confidence]
+    # Filter by confidence in SQL and stream rows instead of loading them all
+    skipped = db.count_leads() - db.count_leads(min_confidence=min_confidence)
+    if skipped:
+        console.print(f"Filtered {skipped} low-confidence leads (<{min_confidence}%)", style="dim")
     
-    if len(leads_data) < original_count:
-        console.print(f"Filtered {original_count - len(leads_data)} low-confidence leads (<{min_confidence}%)", style="dim")
+    leads_iter = db.iter_leads(min_confidence=min_confidence, limit=10000)  # Export all
+    first_lead = next(leads_iter, None)
     
-    if not leads_data:
+    if first_lead is None:
         console.print("No leads to export.", style="yellow")
         return
     
     output_path = PROJECT_ROOT / "data" / f"{output}.{format}"
     output_path.parent.mkdir(exist_ok=True)
+    exported = 0
     
     if format == 'csv':
-        # Add human-readable keywords summary
-        for lead in leads_data:
-            keywords_dict = lead.get("keywords_matched", {})
-            if isinstance(keywords_dict, str):
-                import json
-                try:
-                    keywords_dict = json.loads(keywords_dict)
-                except:
-                    keywords_dict = {}
-            
-            # Create readable summary: "Boiler, DG Set [machinery] | Bitumen, VG-30 [commodities]"
-            summary_parts = []
-            for category, kw_list in keywords_dict.items():
-                if kw_list:
-                    kw_str = ", ".join(kw_list[:3])  # Limit to 3 per category
-                    summary_parts.append(f"{kw_str} [{category}]")
-            
-            lead["keywords_summary"] = " | ".join(summary_parts) if summary_parts else "No keywords"
+        # Column order comes from the table schema; put keywords_summary after confidence
+        fieldnames = list(first_lead.keys())
+        if 'confidence' in fieldnames:
+            fieldnames.insert(fieldnames.index('confidence') + 1, 'keywords_summary')
+        else:
+            fieldnames.append('keywords_summary')
         
         with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            if leads_data:
-                # Reorder columns to put keywords_summary after confidence
-                all_keys = list(leads_data[0].keys())
-                if 'keywords_summary' in all_keys:
-                    all_keys.remove('keywords_summary')
-                    # Insert after confidence
-                    if 'confidence' in all_keys:
-                        conf_idx = all_keys.index('confidence')
-                        all_keys.insert(conf_idx + 1, 'keywords_summary')
-                    else:
-                        all_keys.append('keywords_summary')
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+            writer.writeheader()
+            
+            for lead in chain((first_lead,), leads_iter):
+                # keywords_matched is always stored as a JSON string
+                try:
+                    keywords_dict = json.loads(lead.get("keywords_matched") or "{}")
+                except (TypeError, ValueError):
+                    keywords_dict = {}
+                
+                # Create readable summary: "Boiler, DG Set [machinery] | Bitumen, VG-30 [commodities]"
+                summary_parts = []
+                for category, kw_list in keywords_dict.items():
+                    if kw_list:
+                        kw_str = ", ".join(kw_list[:3])  # Limit to 3 per category
+                        summary_parts.append(f"{kw_str} [{category}]")
                 
-                writer = csv.DictWriter(f, fieldnames=all_keys)
-                writer.writeheader()
-                writer.writerows(leads_data)
+                lead["keywords_summary"] = " | ".join(summary_parts) if summary_parts else "No keywords"
+                writer.writerow(lead)
+                exported += 1
     else:
+        leads_data = [first_lead, *leads_iter]
+        exported = len(leads_data)
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(leads_data, f, indent=2, default=str)
     
-    console.print(f"✅ Exported {len(leads_data)} leads to {output_path}", style="green")
+    console.print(f"✅ Exported {exported} leads to {output_path}", style="green")
 
 
 if __name__ == "__main__":
@@ -9,9 +9,15 @@ This script:
 5. Exports the result to 'specialty_leads_with_officers.csv'
 """
 
+import numpy as np
 import pandas as pd
 import json
+import os
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from itertools import chain
 from pathlib import Path
 
 # Specialty Products Keywords
@@ -26,6 +32,19 @@ SPECIALTY_PRODUCTS = [
     r'Marine Bunker Fuel', r'Bunker Fuel', r'Marine Fuel'
 ]
 
+# Single alternation over SPECIALTY_PRODUCTS (longest alternatives first so
+# e.g. "MTO 2445" wins over "MTO"), compiled once at import.
+PATTERN = re.compile(
+    r'(?i)(jute batch oil|jbo|mineral turpentine oil|mto(?:\s*2445)?|solvent\s*1425|hexane|'
+    r'propylene|molten sulphur|sulphur|bitumen|marine bunker fuel|bunker fuel|marine fuel)'
+)
+
+# Whitespace-stripped lowercase match -> display label used in Specialty_Products_Found
+_PRODUCT_LABELS = {
+    ''.join(p.replace(r'\s*', '').lower().split()): p.replace(r'\s*', ' ')
+    for p in SPECIALTY_PRODUCTS
+}
+
 # State to Zone/Office Mapping (approximate based on Lube RO locations)
 STATE_OFFICE_MAP = {
     'Maharashtra': ['Mumbai', 'Pune', 'Nagpur'], # Multiple offices
@@ -50,67 +69,164 @@ STATE_OFFICE_MAP = {
     'Telangana': ['Chennai'] # Or Hyderabad
 }
 
-def load_lube_officers():
+# STATE_OFFICE_MAP as parallel arrays indexed by categorical code
+STATE_NAMES = list(STATE_OFFICE_MAP)
+DEFAULT_OFFICES = np.array([offices[0] for offices in STATE_OFFICE_MAP.values()], dtype=object)
+
+# Multi-office states: one case-insensitive alternation of their office names,
+# used to pick the office a lead's city mentions
+MULTI_OFFICE_PATTERNS = {
+    state: re.compile('(?i)(' + '|'.join(re.escape(o) for o in offices) + ')')
+    for state, offices in STATE_OFFICE_MAP.items() if len(offices) > 1
+}
+# Lower-cased office name -> canonical STATE_OFFICE_MAP spelling
+_OFFICE_NAMES = {o.lower(): o for offices in STATE_OFFICE_MAP.values() for o in offices}
+
+LUBE_OFFICERS_FILE = Path('config/lube_regional_officer.json')
+
+@lru_cache(maxsize=4)
+def _read_lube_officers(path, mtime):
+    """Parsed officer list, cached per file version (path + mtime)"""
+    with open(path, 'r') as f:
+        data = json.load(f)
+        return data.get('lube_officers', [])
+
+def load_lube_officers(path=LUBE_OFFICERS_FILE):
     try:
-        with open('config/lube_regional_officer.json', 'r') as f:
-            data = json.load(f)
-            return data.get('lube_officers', [])
+        return _read_lube_officers(str(path), Path(path).stat().st_mtime)
     except FileNotFoundError:
-        print("Error: config/lube_regional_officers.json not found.")
+        print(f"Error: {path} not found.")
         return []
 
-def get_specialty_product_match(description):
-    """Check if lead description matches any specialty product"""
-    if pd.isna(description):
-        return None
-    
-    matches = []
-    for pattern in SPECIALTY_PRODUCTS:
-        if re.search(pattern, str(description), re.IGNORECASE):
-            matches.append(pattern.replace(r'\s*', ' ').replace(r'\\b', ''))
+def _format_matches(matches):
+    """Collapse raw PATTERN matches into a sorted, de-duplicated label string"""
+    labels = {_PRODUCT_LABELS[''.join(m.lower().split())] for m in matches}
+    return ", ".join(sorted(labels)) or None
+
+def index_lube_officers(officers):
+    """
+    Build the lookup tables assign_lube_officers reads:
+    officer_by_location (first officer listed per office) and
+    default_officer_by_state (first listed officer serving each mapped state)
+    """
+    officer_by_location = {}
+    for officer in officers:
+        officer_by_location.setdefault(officer['location'], officer)
     
-    return ", ".join(list(set(matches))) if matches else None
+    default_officer_by_state = {
+        state: next((o for o in officers if o['location'] in offices), None)
+        for state, offices in STATE_OFFICE_MAP.items()
+    }
+    return officer_by_location, default_officer_by_state
+
+CHUNK_SIZE = 100_000
+# Worker processes for chunk enrichment; at most 2x this many chunks are in flight
+MAX_WORKERS = os.cpu_count() or 1
+
+# Explicit dtypes for the text columns we touch: skips per-chunk type inference,
+# and State as a category keeps the per-state lookups per category, not per row.
+# All columns are still read since the export keeps the full row.
+CSV_DTYPES = {
+    'State': 'category',
+    'Location': str,
+    'Project_Description': str,
+    'Project Name': str,
+}
 
-def find_nearest_lube_officer(state, city, officers):
-    """Find the most appropriate Lube RO based on state and city"""
+OFFICER_COLS = ['Lube_Officer_Name', 'Lube_Officer_Email', 'Lube_Officer_Phone', 'Lube_Officer_Address']
+UNASSIGNED_OFFICER = {
+    'Lube_Officer_Name': "Unassigned",
+    'Lube_Officer_Email': "lubescare@hpcl.in",
+    'Lube_Officer_Phone': "1800-2333-555",
+    'Lube_Officer_Address': "Please contact HQ",
+}
+
+def assign_lube_officers(df, officer_by_location, default_officer_by_state):
+    """
+    Add the lube officer columns to every specialty lead in df. Each lead goes
+    to its state's first office in STATE_OFFICE_MAP, or, in multi-office states,
+    to the office its city names; if that office has no officer, to the state's
+    default officer, and otherwise to the HQ contact (UNASSIGNED_OFFICER)
+    """
+    officers_df = pd.DataFrame(list(officer_by_location.values()))
+    officers_df = officers_df.reindex(columns=['location', 'name', 'email', 'phone', 'address']).rename(
+        columns=dict(zip(['name', 'email', 'phone', 'address'], OFFICER_COLS))).set_index('location')
+    known_locations = set(officer_by_location)
     
-    # Simple logic: Check explicit state mapping first
-    target_offices = STATE_OFFICE_MAP.get(state, [])
+    fallback_offices = np.array([
+        officer['location'] if officer else None
+        for officer in (default_officer_by_state.get(st) for st in STATE_NAMES)
+    ], dtype=object)
     
-    if not target_offices:
-        return None # No mapping found
+    state = df['State'] if 'State' in df else pd.Series(np.nan, index=df.index)
+    city = df['Location'] if 'Location' in df else pd.Series(np.nan, index=df.index)
     
-    # If multiple offices (e.g. MH has Mumbai, Pune, Nagpur), try to match city/district
-    selected_office_location = target_offices[0] # Default to first
+    # Default office per row: one gather on the state's categorical code (-1 = unmapped)
+    codes = pd.Categorical(state, categories=STATE_NAMES).codes
+    mapped = codes >= 0
+    safe_codes = np.clip(codes, 0, None)
+    selected = pd.Series(np.where(mapped, DEFAULT_OFFICES[safe_codes], None), index=df.index, dtype=object)
+    fallback = pd.Series(np.where(mapped, fallback_offices[safe_codes], None), index=df.index, dtype=object)
     
-    if len(target_offices) > 1 and city:
-        city_lower = str(city).lower()
-        # Heuristic: if city name matches office location, pick that
-        for office_loc in target_offices:
-            if office_loc.lower() in city_lower:
-                selected_office_location = office_loc
-                break
-        
-        # Additional heuristics could be added here (distance based)
+    # Multi-office states: the office the city mentions overrides the default
+    for st, pattern in MULTI_OFFICE_PATTERNS.items():
+        in_state = (codes == STATE_NAMES.index(st)) & city.notna().to_numpy()
+        if not in_state.any():
+            continue
+        city_hit = city[in_state].astype(str).str.extract(pattern, expand=False).str.lower().map(_OFFICE_NAMES)
+        selected.loc[city_hit.index] = city_hit.where(city_hit.notna(), selected.loc[city_hit.index])
     
-    # Find the officer entry for this location
-    for officer in officers:
-        if officer['location'] == selected_office_location:
-            return officer
-            
-    # Fallback to first if exact location match fails but state mapped
-    for officer in officers:
-         if officer['location'] in target_offices:
-             return officer
-             
-    return None
+    selected = selected.where(selected.isin(known_locations), fallback)
+    is_specialty = df['Specialty_Products_Found'].notna()
+    selected = selected.where(is_specialty)
+    
+    # Indexed gather of officer rows by office; unknown/None offices come back empty
+    officers = officers_df.reindex(selected.to_numpy())
+    
+    unmatched = is_specialty & ~selected.isin(known_locations)
+    for col in OFFICER_COLS:
+        df[col] = pd.Series(officers[col].to_numpy(), index=df.index).where(~unmatched, UNASSIGNED_OFFICER[col])
+    return df
+
+def enrich_chunk(chunk, officer_by_location, default_officer_by_state):
+    """Specialty leads of one CSV chunk, with their lube officer columns added"""
+    found = chunk['Project_Description'].fillna('').astype(str).str.findall(PATTERN)
+    chunk['Specialty_Products_Found'] = found.map(_format_matches)
+    specialty_leads = chunk[chunk['Specialty_Products_Found'].notna()].copy()
+    if specialty_leads.empty:
+        return specialty_leads
+    return assign_lube_officers(specialty_leads, officer_by_location, default_officer_by_state)
+
+def _enrich_in_parallel(reader, enrich):
+    """
+    Yield enrich(chunk) in input order, keeping a bounded number of chunks in flight.
+    A file that fits in one chunk (the usual case) is enriched in-process; the
+    worker pool is only started, and chunks pickled to it, once a second chunk is read.
+    """
+    reader = iter(reader)
+    first = next(reader, None)
+    if first is None:
+        return
+    second = next(reader, None)
+    if second is None:
+        yield enrich(first)
+        return
+    
+    with ProcessPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        pending = deque()
+        for chunk in chain((first, second), reader):
+            pending.append(ex.submit(enrich, chunk))
+            if len(pending) >= 2 * MAX_WORKERS:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
 
 def main():
     print("Mapping Specialty Leads to Lube Officers...")
     
-    # 1. Load Data
+    # 1. Load Data (streamed in chunks so memory stays bounded on large exports)
     try:
-        df = pd.read_csv('data/filtered_dataset.csv')
+        reader = pd.read_csv('data/filtered_dataset.csv', dtype=CSV_DTYPES, chunksize=CHUNK_SIZE)
     except FileNotFoundError:
         print("Error: data/filtered_dataset.csv not found. Run filter_leads.py first.")
         return
@@ -118,45 +234,41 @@ def main():
     lube_officers = load_lube_officers()
     if not lube_officers:
         return
+    officer_by_location, default_officer_by_state = index_lube_officers(lube_officers)
 
-    # 2. Identify Specialty Leads
-    print("Identifying specialty product leads...")
-    df['Specialty_Products_Found'] = df['Project_Description'].apply(get_specialty_product_match)
-    
-    # 3. Map Officers
-    print("Mapping officers...")
-    
-    def map_row(row):
-        matches = row['Specialty_Products_Found']
-        if not matches:
-             return pd.Series([None, None, None, None]) # No conversion if not specialty
-             
-        officer = find_nearest_lube_officer(row.get('State'), row.get('Location'), lube_officers)
-        
-        if officer:
-            return pd.Series([officer.get('name'), officer.get('email'), officer.get('phone'), officer.get('address')])
-        else:
-            return pd.Series(["Unassigned", "lubescare@hpcl.in", "1800-2333-555", "Please contact HQ"])
-
-    officer_cols = ['Lube_Officer_Name', 'Lube_Officer_Email', 'Lube_Officer_Phone', 'Lube_Officer_Address']
-    df[officer_cols] = df.apply(map_row, axis=1)
-    
     # Filter to only showing leads that have matched products (optional, or just enrich all)
     # The user said "only map the officer... with the leads that have heavy weights in above mentioned products"
     # So we should probably allow the user to see the full list or just the matched ones.
     # Let's create a subset for the "Specialty Team"
+    print("Identifying specialty product leads and mapping officers...")
+    output_file = Path('data/lube_specialty_leads.csv')
+    out = None
+    found_count = 0
+    sample = None
+    try:
+        # 2. Identify Specialty Leads / 3. Map Officers, one chunk per worker
+        enrich = partial(enrich_chunk, officer_by_location=officer_by_location,
+                         default_officer_by_state=default_officer_by_state)
+        for specialty_leads in _enrich_in_parallel(reader, enrich):
+            if specialty_leads.empty:
+                continue
+            
+            if out is None:
+                out = open(output_file, 'w', encoding='utf-8-sig', newline='')
+            specialty_leads.to_csv(out, index=False, header=found_count == 0)
+            found_count += len(specialty_leads)
+            if sample is None:
+                sample = specialty_leads.iloc[0]
+    finally:
+        if out is not None:
+            out.close()
     
-    specialty_leads = df[df['Specialty_Products_Found'].notna()].copy()
-    
-    if not specialty_leads.empty:
-        output_file = Path('data/lube_specialty_leads.csv')
-        specialty_leads.to_csv(output_file, index=False, encoding='utf-8-sig')
-        print(f"Found {len(specialty_leads)} specialty product leads.")
+    if sample is not None:
+        print(f"Found {found_count} specialty product leads.")
         print(f"Exported to {output_file}")
         
         # Display sample
         print("\nSample Mapped Lead:")
-        sample = specialty_leads.iloc[0]
         # Try multiple variations for Project Name
         project_name = sample.get('Project Name', sample.get('Project_Name', 'Unknown Project'))
         print(f"Project: {project_name}")
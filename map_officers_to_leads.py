@@ -4,7 +4,7 @@ Industrial-grade script to automatically populate HPCL officer contact informati
 in filtered_dataset.csv based on geographical proximity.
 
 This script:
-1. Reads the filtered dataset CSV
+1. Streams the filtered dataset CSV in chunks
 2. Extracts location information from each lead
 3. Finds the nearest HPCL officer for each lead
 4. Adds officer contact columns to the CSV
@@ -23,9 +23,21 @@ from proximity_service import ProximityService
 from location_extractor import extract_district_city
 
 
+# Rows read per chunk; bounds memory for datasets too large to load at once
+CHUNK_SIZE = 100_000
+
+
 class OfficerMapper:
     """Maps HPCL officers to leads based on proximity"""
     
+    # Dtypes for the location columns; every other column is inferred as before
+    CSV_DTYPES = {
+        'State': 'category',
+        'Location': str,
+        'Project_Description': str,
+        'Project Name': str,
+    }
+    
     def __init__(self, 
                  dataset_path: str = "data/filtered_dataset.csv",
                  officers_file: str = "config/hpcl_officers.json"):
@@ -38,15 +50,11 @@ class OfficerMapper:
         """
         self.dataset_path = Path(dataset_path)
         self.proximity_service = ProximityService(officers_file)
-        self.df = None
-        
-    def load_dataset(self) -> pd.DataFrame:
-        """Load the filtered dataset"""
-        print(f"Loading dataset from {self.dataset_path}...")
-        self.df = pd.read_csv(self.dataset_path)
-        print(f"  ✓ Loaded {len(self.df)} leads")
-        return self.df
-    
+        # Where the last map_officers_to_dataset() run wrote its output
+        self.output_path = None
+        # (state, normalized location) -> officer_info, shared across rows
+        self._cache = {}
+        
     def extract_location_from_row(self, row: pd.Series) -> tuple[str, str]:
         """
         Extract location and state from a dataset row
@@ -57,18 +65,26 @@ class OfficerMapper:
         Returns:
             (location, state) tuple
         """
-        # Get state (should always be present)
-        state = str(row.get('State', '')).strip()
-        
-        # Try to extract more specific location from Location column
-        location_field = str(row.get('Location', '')).strip()
+        return self.extract_location(row.get('State', ''), row.get('Location', ''),
+                                     row.get('Project_Description', ''), row.get('Project Name', ''))
+    
+    def extract_location(self, state, location_field, description, project_name) -> tuple[str, str]:
+        """
+        Extract location and state from raw column values
         
+        Returns:
+            (location, state) tuple
+        """
+        return self._locate(str(state).strip(), str(location_field).strip(),
+                            str(description) + " " + str(project_name))
+    
+    def _locate(self, state: str, location_field: str, project_desc: str) -> tuple[str, str]:
+        """extract_location on already stripped strings"""
         # Try to extract district/city from project description if location is not specific
         if location_field and location_field.lower() != state.lower():
             location = location_field
         else:
             # Extract from project name or description
-            project_desc = str(row.get('Project_Description', '')) + " " + str(row.get('Project Name', ''))
             location = extract_district_city(location_field, project_desc, state)
             
             # Fallback to state if no specific location found
@@ -77,89 +93,137 @@ class OfficerMapper:
         
         return location, state
     
-    def map_officers_to_dataset(self, save_path: Optional[str] = None) -> pd.DataFrame:
+    def _map_frame(self, df: pd.DataFrame, start: int = 0, total: Optional[int] = None) -> tuple[int, int]:
         """
-        Map nearest officers to all leads in dataset
+        Add officer columns to df in place
         
         Args:
-            save_path: Optional path to save updated CSV (defaults to overwriting original)
+            df: Leads (whole dataset or one chunk of it)
+            start: Row offset of df within the dataset, for progress output
+            total: Dataset size for progress output (0 if unknown)
             
         Returns:
-            Updated DataFrame with officer columns
+            (successful, failed) counts
         """
-        if self.df is None:
-            self.load_dataset()
-        
-        print("\nMapping nearest HPCL officers to leads...")
-        print("=" * 70)
+        if total is None:
+            total = len(df)
         
-        # Initialize new columns
-        self.df['Officer_Name'] = ''
-        self.df['Officer_Phone'] = ''
-        self.df['Officer_Email'] = ''
-        self.df['Officer_Address'] = ''
-        self.df['Officer_Role'] = ''
-        self.df['Officer_Distance_KM'] = None
+        # Coerce the source columns to clean strings once, not per row
+        def text(col: str) -> pd.Series:
+            if col not in df.columns:
+                return pd.Series('', index=df.index, dtype=object)
+            return df[col].astype(object).fillna('').astype(str)
         
-        total = len(self.df)
-        successful = 0
-        failed = 0
+        states_in = text('State').str.strip()
+        locations_in = text('Location').str.strip()
+        descriptions = text('Project_Description') + " " + text('Project Name')
         
-        for idx, row in self.df.iterrows():
+        # 1. Resolve (state, location) per row
+        states, locations = [], []
+        first_row = {}
+        for idx, row in enumerate(zip(states_in, locations_in, descriptions)):
             # Progress indicator
+            idx += start
             if (idx + 1) % 10 == 0 or (idx + 1) == total:
-                print(f"  Processing: {idx + 1}/{total} leads...", end='\r')
+                print(f"  Processing: {idx + 1}/{total or '?'} leads...", end='\r')
             
+            location = state = None
             try:
                 # Extract location
-                location, state = self.extract_location_from_row(row)
-                
+                location, state = self._locate(*row)
                 if not state:
                     print(f"\n  Warning: No state found for row {idx}, skipping...")
-                    failed += 1
-                    continue
-                
-                # Find nearest officer
-                officer_info = self.proximity_service.find_nearest_officer(location, state)
-                
-                if officer_info:
-                    # Update row with officer information
-                    self.df.at[idx, 'Officer_Name'] = officer_info.get('officer_name', 'N/A')
-                    self.df.at[idx, 'Officer_Phone'] = officer_info.get('officer_phone', 'N/A')
-                    self.df.at[idx, 'Officer_Email'] = officer_info.get('officer_email', 'N/A')
-                    self.df.at[idx, 'Officer_Address'] = officer_info.get('officer_address', 'N/A')
-                    self.df.at[idx, 'Officer_Role'] = officer_info.get('officer_role', 'N/A')
-                    
-                    distance = officer_info.get('distance_km')
-                    if distance is not None:
-                        self.df.at[idx, 'Officer_Distance_KM'] = distance
-                    
-                    successful += 1
-                else:
-                    failed += 1
-                    
+                    location = state = None
+            except Exception as e:
+                print(f"\n  Error processing row {idx}: {e}")
+            
+            states.append(state)
+            locations.append(location)
+            if state is not None:
+                first_row.setdefault((state, location), idx)
+        
+        # 2. Find the nearest officer once per unique pair
+        resolved = []
+        for (state, location), idx in first_row.items():
+            try:
+                officer_info = self.find_nearest_officer(location, state)
             except Exception as e:
                 print(f"\n  Error processing row {idx}: {e}")
-                failed += 1
                 continue
+            if officer_info:
+                resolved.append((
+                    state, location, True,
+                    officer_info.get('officer_name', 'N/A'),
+                    officer_info.get('officer_phone', 'N/A'),
+                    officer_info.get('officer_email', 'N/A'),
+                    officer_info.get('officer_address', 'N/A'),
+                    officer_info.get('officer_role', 'N/A'),
+                    officer_info.get('distance_km'),
+                ))
         
-        print(f"\n\n✓ Mapping completed!")
-        print(f"  Successfully mapped: {successful} leads")
-        print(f"  Failed to map: {failed} leads")
+        # 3. Broadcast back to every row
+        text_cols = ['Officer_Name', 'Officer_Phone', 'Officer_Email', 'Officer_Address', 'Officer_Role']
+        resolved_df = pd.DataFrame(resolved, columns=['_state', '_loc', '_hit'] + text_cols + ['Officer_Distance_KM'])
+        keys = pd.DataFrame({'_state': states, '_loc': locations}, dtype=object)
+        merged = keys.merge(resolved_df, on=['_state', '_loc'], how='left')
+        
+        successful = int(merged['_hit'].notna().sum())
+        failed = len(merged) - successful
         
-        # Save updated dataset
-        output_path = save_path if save_path else self.dataset_path
-        self.save_dataset(output_path)
+        for col in text_cols:
+            df[col] = merged[col].fillna('').to_numpy()
+        df['Officer_Distance_KM'] = merged['Officer_Distance_KM'].to_numpy()
         
-        return self.df
+        return successful, failed
     
-    def save_dataset(self, output_path: str):
-        """Save updated dataset to CSV"""
-        print(f"\nSaving updated dataset to {output_path}...")
-        self.df.to_csv(output_path, index=False, encoding='utf-8')
-        print(f"  ✓ Saved successfully!")
+    def map_officers_to_dataset(self, save_path: Optional[str] = None, chunksize: int = CHUNK_SIZE) -> dict:
+        """
+        Map nearest officers to all leads in dataset
+        
+        Reads the CSV chunksize rows at a time, so memory stays bounded by the chunk
+        size, and appends each mapped chunk to a temp file that replaces the output
+        at the end, so the input can be overwritten.
+        
+        Args:
+            save_path: Optional path to save updated CSV (defaults to overwriting original)
+            chunksize: Rows read per chunk
+            
+        Returns:
+            Dictionary with successful/failed counts
+        """
+        output_path = Path(save_path) if save_path else self.dataset_path
+        tmp_path = output_path.with_name(output_path.name + '.tmp')
+        
+        print(f"Mapping nearest HPCL officers to leads in {self.dataset_path}...")
+        print("=" * 70)
+        
+        successful = failed = start = 0
+        for chunk in pd.read_csv(self.dataset_path, dtype=self.CSV_DTYPES, chunksize=chunksize):
+            ok, bad = self._map_frame(chunk, start=start, total=0)
+            successful += ok
+            failed += bad
+            chunk.to_csv(tmp_path, mode='w' if start == 0 else 'a', header=start == 0,
+                         index=False, encoding='utf-8')
+            start += len(chunk)
+        
+        tmp_path.replace(output_path)
+        self.output_path = output_path
+        
+        print(f"\n\n✓ Mapping completed!")
+        print(f"  Successfully mapped: {successful} leads")
+        print(f"  Failed to map: {failed} leads")
+        print(f"\n  ✓ Saved to {output_path}")
         print(f"  New columns added: Officer_Name, Officer_Phone, Officer_Email,")
         print(f"                     Officer_Address, Officer_Role, Officer_Distance_KM")
+        
+        return {'successful': successful, 'failed': failed}
+    
+    def find_nearest_officer(self, location: str, state: str) -> Optional[dict]:
+        """Proximity lookup memoized on (state, normalized location)"""
+        key = (state, location.lower().strip())
+        if key not in self._cache:
+            self._cache[key] = self.proximity_service.find_nearest_officer(location, state)
+        return self._cache[key]
     
     def validate_mapping(self) -> dict:
         """
@@ -168,16 +232,35 @@ class OfficerMapper:
         Returns:
             Dictionary with validation statistics
         """
-        if self.df is None:
-            raise ValueError("No dataset loaded. Call load_dataset() first.")
+        if self.output_path is None:
+            raise ValueError("No mapped dataset. Call map_officers_to_dataset() first.")
+        
+        # Stream the mapped output, reading only the columns the report needs;
+        # a name counts as mapped unless missing, '' or 'N/A'
+        stat_cols = ['State', 'Officer_Name', 'Officer_Distance_KM', 'Officer_Email']
+        sample_cols = ['State', 'Location', 'Officer_Name', 'Officer_Phone', 'Officer_Email', 'Officer_Distance_KM']
+        header = pd.read_csv(self.output_path, nrows=0).columns
+        usecols = [col for col in dict.fromkeys(stat_cols + sample_cols) if col in header]
+        
+        total = named = with_distance = 0
+        emails, states = set(), set()
+        sample = None
+        for chunk in pd.read_csv(self.output_path, usecols=usecols, chunksize=CHUNK_SIZE):
+            if sample is None:
+                sample = chunk.head(5)
+            total += len(chunk)
+            names = chunk['Officer_Name']
+            named += int((names.notna() & ~names.isin(['', 'N/A'])).sum())
+            with_distance += int(chunk['Officer_Distance_KM'].count())
+            emails.update(chunk['Officer_Email'].dropna())
+            states.update(chunk['State'].dropna())
         
         stats = {
-            'total_leads': len(self.df),
-            'mapped_with_name': (self.df['Officer_Name'] != '').sum(),
-            'mapped_with_name': (self.df['Officer_Name'].notna() & (self.df['Officer_Name'] != 'N/A')).sum(),
-            'mapped_with_distance': self.df['Officer_Distance_KM'].notna().sum(),
-            'unique_officers': self.df['Officer_Email'].nunique(),
-            'states_covered': self.df['State'].nunique(),
+            'total_leads': total,
+            'mapped_with_name': named,
+            'mapped_with_distance': with_distance,
+            'unique_officers': len(emails),
+            'states_covered': len(states),
         }
         
         print("\n" + "=" * 70)
@@ -191,9 +274,8 @@ class OfficerMapper:
         
         # Show sample of mapped data
         print("\nSample of mapped data:")
-        sample_cols = ['State', 'Location', 'Officer_Name', 'Officer_Phone', 'Officer_Email', 'Officer_Distance_KM']
-        available_cols = [col for col in sample_cols if col in self.df.columns]
-        print(self.df[available_cols].head(5).to_string(index=False))
+        available_cols = [col for col in sample_cols if col in usecols]
+        print(sample[available_cols].to_string(index=False))
         
         return stats
 
@@ -216,13 +298,6 @@ def main():
         print("   Please run filter_leads.py first to generate the filtered dataset.")
         return 1
     
-    # Load dataset
-    try:
-        mapper.load_dataset()
-    except Exception as e:
-        print(f"❌ Error loading dataset: {e}")
-        return 1
-    
     # Map officers
     try:
         mapper.map_officers_to_dataset()
@@ -5,17 +5,23 @@ Database Module - SQLite storage for leads.
 import sqlite3
 import json
 import logging
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Sequence
 from contextlib import contextmanager
 
-import sys
-sys.path.append(str(__file__).rsplit('\\', 2)[0])
 from config.settings import DB_PATH
 
 logger = logging.getLogger(__name__)
 
+_EMPTY_JSON = "{}"
+
+
+def _json_or_empty(value: Any) -> str:
+    """Serialize a JSON column, skipping the encoder for empty/missing payloads."""
+    return json.dumps(value) if value else _EMPTY_JSON
+
 
 class Database:
     """SQLite database manager for leads."""
@@ -58,73 +64,113 @@ class Database:
     );
     """
     
+    # Columns of the leads table (whitelist for column projections)
+    LEAD_COLUMNS = (
+        "id", "company_name", "signal_type", "source", "source_url",
+        "product_match", "sector", "score", "confidence", "territory",
+        "sales_officer", "keywords_matched", "raw_data", "discovered_at",
+        "status", "notes",
+    )
+    
     def __init__(self, db_path: Path = DB_PATH):
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One long-lived connection so SQLite's page and statement caches survive
+        # between calls; the lock serialises access across threads.
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA cache_size=-65536")
+        # Memory-map up to 256 MB of the file and keep temp b-trees (ORDER BY) in RAM
+        self._conn.execute("PRAGMA mmap_size=268435456")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._lock = threading.RLock()
+        self._depth = 0
         self._init_db()
         
     def _init_db(self):
         """Initialize database schema."""
         with self.get_connection() as conn:
+            # WAL persists in the database file; lets readers run alongside batch writes
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.executescript(self.SCHEMA)
             logger.info(f"Database initialized at {self.db_path}")
     
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+        """Context manager for the shared connection; the outermost block commits."""
+        with self._lock:
+            self._depth += 1
+            try:
+                yield self._conn
+                if self._depth == 1:
+                    self._conn.commit()
+            except Exception as e:
+                if self._depth == 1:
+                    self._conn.rollback()
+                raise
+            finally:
+                self._depth -= 1
+    
+    def close(self):
+        """Close the shared connection."""
+        with self._lock:
+            self._conn.close()
+    
+    # Rows pulled per fetchmany() round-trip in bulk reads
+    FETCH_SIZE = 1000
+    
+    INSERT_LEAD_SQL = """
+        INSERT INTO leads (
+            company_name, signal_type, source, source_url,
+            product_match, sector, score, confidence, territory, sales_officer, 
+            keywords_matched, raw_data, discovered_at, status
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    @staticmethod
+    def _lead_params(lead: Dict[str, Any]) -> tuple:
+        """Parameter tuple for INSERT_LEAD_SQL."""
+        return (
+            lead.get("company_name", "Unknown"),
+            lead.get("signal_type", "Unknown"),
+            lead.get("source", "Unknown"),
+            lead.get("source_url"),
+            lead.get("product_match"),
+            lead.get("sector"),
+            lead.get("score", 0),
+            lead.get("confidence", 0),
+            lead.get("territory"),
+            lead.get("sales_officer"),
+            _json_or_empty(lead.get("keywords_matched")),
+            _json_or_empty(lead.get("raw_data")),
+            lead.get("discovered_at", datetime.now().isoformat()),
+            lead.get("status", "NEW"),
+        )
     
     def insert_lead(self, lead: Dict[str, Any]) -> Optional[int]:
         """Insert a new lead, returns ID or None if duplicate."""
         with self.get_connection() as conn:
             try:
-                cursor = conn.execute("""
-                    INSERT INTO leads (
-                        company_name, signal_type, source, source_url,
-                        product_match, sector, score, confidence, territory, sales_officer, 
-                        keywords_matched, raw_data, discovered_at, status
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    lead.get("company_name", "Unknown"),
-                    lead.get("signal_type", "Unknown"),
-                    lead.get("source", "Unknown"),
-                    lead.get("source_url"),
-                    lead.get("product_match"),
-                    lead.get("sector"),
-                    lead.get("score", 0),
-                    lead.get("confidence", 0),
-                    lead.get("territory"),
-                    lead.get("sales_officer"),
-                    json.dumps(lead.get("keywords_matched", {})),
-                    json.dumps(lead.get("raw_data", {})),
-                    lead.get("discovered_at", datetime.now().isoformat()),
-                    lead.get("status", "NEW"),
-                ))
+                cursor = conn.execute(self.INSERT_LEAD_SQL, self._lead_params(lead))
                 return cursor.lastrowid
             except sqlite3.IntegrityError:
                 # Duplicate entry
                 return None
     
     def insert_leads_batch(self, leads: List[Dict[str, Any]]) -> Dict[str, int]:
-        """Batch insert leads, returns counts."""
-        inserted = 0
-        duplicates = 0
+        """Batch insert leads in a single transaction, returns counts."""
+        rows = [self._lead_params(lead) for lead in leads]
+        if not rows:
+            return {"inserted": 0, "duplicates": 0}
         
-        for lead in leads:
-            result = self.insert_lead(lead)
-            if result:
-                inserted += 1
-            else:
-                duplicates += 1
+        with self.get_connection() as conn:
+            # OR IGNORE skips UNIQUE violations instead of aborting the batch
+            cursor = conn.executemany(
+                self.INSERT_LEAD_SQL.replace("INSERT INTO", "INSERT OR IGNORE INTO", 1), rows
+            )
+            inserted = cursor.rowcount
+        duplicates = len(rows) - inserted
         
         logger.info(f"Batch insert: {inserted} new, {duplicates} duplicates")
         return {"inserted": inserted, "duplicates": duplicates}
@@ -136,9 +182,19 @@ class Database:
         min_score: Optional[float] = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> List[Dict[str, Any]]:
-        """Query leads with filters."""
-        query = "SELECT * FROM leads WHERE 1=1"
+        columns: Optional[Sequence[str]] = None,
+    ) -> List[Any]:
+        """
+        Query leads with filters.
+        Returns dicts, or plain tuples in `columns` order if columns are given.
+        """
+        if columns:
+            unknown = set(columns) - set(self.LEAD_COLUMNS)
+            if unknown:
+                raise ValueError(f"Unknown lead columns: {sorted(unknown)}")
+            query = f"SELECT {', '.join(columns)} FROM leads WHERE 1=1"
+        else:
+            query = "SELECT * FROM leads WHERE 1=1"
         params = []
         
         if status:
@@ -155,8 +211,60 @@ class Database:
         params.extend([limit, offset])
         
         with self.get_connection() as conn:
-            rows = conn.execute(query, params).fetchall()
-            return [dict(row) for row in rows]
+            cursor = conn.cursor()
+            cursor.arraysize = self.FETCH_SIZE
+            if columns:
+                # Plain tuples straight from the driver, no Row objects
+                cursor.row_factory = None
+            cursor.execute(query, params)
+            
+            result = []
+            convert = tuple if columns else dict
+            while batch := cursor.fetchmany():
+                result.extend(map(convert, batch))
+            return result
+    
+    def iter_leads(
+        self,
+        min_confidence: Optional[float] = None,
+        limit: int = 10000,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream leads one row at a time (for large exports)."""
+        query = "SELECT * FROM leads"
+        params = []
+        
+        if min_confidence is not None:
+            query += " WHERE confidence >= ?"
+            params.append(min_confidence)
+            
+        query += " ORDER BY score DESC, discovered_at DESC LIMIT ?"
+        params.append(limit)
+        
+        # Own read connection, not get_connection(): the shared lock and
+        # transaction would otherwise stay held between yields, and for good
+        # if the consumer abandons the iterator. WAL lets it read alongside writers.
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.arraysize = self.FETCH_SIZE
+            cursor.execute(query, params)
+            while batch := cursor.fetchmany():
+                yield from map(dict, batch)
+        finally:
+            conn.close()
+    
+    def count_leads(self, min_confidence: Optional[float] = None) -> int:
+        """Count leads, optionally above a confidence threshold."""
+        query = "SELECT COUNT(*) FROM leads"
+        params = []
+        
+        if min_confidence is not None:
+            query += " WHERE confidence >= ?"
+            params.append(min_confidence)
+        
+        with self.get_connection() as conn:
+            return conn.execute(query, params).fetchone()[0]
     
     def get_lead_by_id(self, lead_id: int) -> Optional[Dict[str, Any]]:
         """Get a specific lead by ID."""
@@ -177,12 +285,15 @@ class Database:
     def get_stats(self) -> Dict[str, Any]:
         """Get dashboard statistics."""
         with self.get_connection() as conn:
-            stats = {}
+            # Totals, high-score (>70) and recent (last 24h) in one pass over leads
+            totals = conn.execute(
+                "SELECT COUNT(*) AS total, "
+                "COUNT(CASE WHEN score >= 70 THEN 1 END) AS high_score, "
+                "COUNT(CASE WHEN discovered_at >= datetime('now', '-1 day') THEN 1 END) AS recent "
+                "FROM leads"
+            ).fetchone()
             
-            # Total leads
-            stats["total_leads"] = conn.execute(
-                "SELECT COUNT(*) FROM leads"
-            ).fetchone()[0]
+            stats = {"total_leads": totals["total"]}
             
             # By status
             rows = conn.execute(
@@ -197,15 +308,8 @@ class Database:
             ).fetchall()
             stats["by_product"] = {row["product_match"]: row["count"] for row in rows}
             
-            # High-score leads (>70)
-            stats["high_score_leads"] = conn.execute(
-                "SELECT COUNT(*) FROM leads WHERE score >= 70"
-            ).fetchone()[0]
-            
-            # Recent (last 24h)
-            stats["recent_leads"] = conn.execute(
-                "SELECT COUNT(*) FROM leads WHERE discovered_at >= datetime('now', '-1 day')"
-            ).fetchone()[0]
+            stats["high_score_leads"] = totals["high_score"]
+            stats["recent_leads"] = totals["recent"]
             
             return stats
     
@@ -2,14 +2,17 @@
 Lead Model - Data class for petroleum intelligence leads.
 """
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Lead:
-    """Represents a potential petroleum product sales lead."""
+    """
+    Represents a potential petroleum product sales lead.
+    Slotted: no per-instance __dict__, fixed attribute set.
+    """
     
     company_name: str
     signal_type: str
@@ -28,8 +31,12 @@ class Lead:
     notes: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for database storage."""
-        data = asdict(self)
+        """
+        Convert to dictionary for database storage.
+        Shallow: keywords_matched and raw_data are the Lead's own objects,
+        so enriching the dict in place also updates the Lead.
+        """
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
         data["discovered_at"] = self.discovered_at.isoformat()
         return data
     
@@ -6,46 +6,113 @@ NO API KEY REQUIRED - completely free.
 Rate limit: 1 request/second (we'll add caching to minimize calls)
 """
 
-import urllib.request
-import urllib.parse
+import atexit
 import json
+import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 class NominatimGeocoder:
     """Free geocoding using OpenStreetMap Nominatim API"""
     
     BASE_URL = "https://nominatim.openstreetmap.org/search"
-    CACHE_FILE = Path("data/geocode_cache.json")
+    CACHE_FILE = Path("data/geocode_cache.sqlite")
+    LEGACY_CACHE_FILE = Path("data/geocode_cache.json")  # Imported once into CACHE_FILE
+    USER_AGENT = "PetroleumIntel/1.0 (lead-scoring-system)"
+    FLUSH_EVERY = 50  # Cache writes between commits
     
     def __init__(self):
-        self.cache = self._load_cache()
+        self._db = self._open_cache()
         self.last_request = 0
+        self.session = self._create_session()
+        # Token bucket shared by all threads: next time a request may start
+        self._bucket_lock = threading.Lock()
+        self._next_slot = 0.0
+        # Guards the cache connection when geocoding from several threads
+        self._cache_lock = threading.Lock()
+        # Uncommitted cache entries; committed every FLUSH_EVERY, on close()
+        # and, for the shared geocoder, at exit
+        self._dirty_count = 0
     
-    def _load_cache(self):
-        """Load cached geocoding results"""
-        try:
-            if self.CACHE_FILE.exists():
-                with open(self.CACHE_FILE, 'r') as f:
-                    return json.load(f)
-        except:
-            pass
-        return {}
+    def _create_session(self):
+        """Keep-alive session so repeat lookups reuse the TLS connection"""
+        session = requests.Session()
+        session.headers['User-Agent'] = self.USER_AGENT
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+        session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retry))
+        return session
     
-    def _save_cache(self):
-        """Save cache to disk"""
-        try:
-            self.CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.CACHE_FILE, 'w') as f:
-                json.dump(self.cache, f, indent=2)
-        except Exception as e:
-            print(f"Warning: Could not save cache: {e}")
+    def _open_cache(self):
+        """Open the SQLite cache, importing the legacy JSON cache on first use"""
+        self.CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.CACHE_FILE, check_same_thread=False)
+        db.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, lat REAL, lon REAL)")
+        
+        is_empty = db.execute("SELECT 1 FROM cache LIMIT 1").fetchone() is None
+        if is_empty and self.LEGACY_CACHE_FILE.exists():
+            try:
+                with open(self.LEGACY_CACHE_FILE, 'r') as f:
+                    legacy = json.load(f)
+                db.executemany(
+                    "INSERT OR REPLACE INTO cache (key, lat, lon) VALUES (?, ?, ?)",
+                    ((key, *(coords or (None, None))) for key, coords in legacy.items()),
+                )
+            except Exception as e:
+                print(f"Warning: Could not import {self.LEGACY_CACHE_FILE}: {e}")
+        db.commit()
+        return db
+    
+    def _cache_get(self, cache_key):
+        """(found, coords) for a key; misses are stored with NULL lat/lon"""
+        with self._cache_lock:
+            row = self._db.execute("SELECT lat, lon FROM cache WHERE key = ?", (cache_key,)).fetchone()
+        if row is None:
+            return False, None
+        return True, (row if row[0] is not None else None)
+    
+    def _cache_put(self, cache_key, coords):
+        """Record a result; commit every FLUSH_EVERY new entries"""
+        lat, lon = coords if coords else (None, None)
+        with self._cache_lock:
+            self._db.execute("INSERT OR REPLACE INTO cache (key, lat, lon) VALUES (?, ?, ?)",
+                             (cache_key, lat, lon))
+            self._dirty_count += 1
+            if self._dirty_count >= self.FLUSH_EVERY:
+                self._db.commit()
+                self._dirty_count = 0
+    
+    def flush(self):
+        """Commit any pending cache entries"""
+        with self._cache_lock:
+            if self._dirty_count:
+                try:
+                    self._db.commit()
+                    self._dirty_count = 0
+                except sqlite3.Error as e:
+                    print(f"Warning: Could not save cache: {e}")
+    
+    def close(self):
+        """Commit pending cache entries and close the cache"""
+        self.flush()
+        with self._cache_lock:
+            self._db.close()
+        self.session.close()
     
     def _rate_limit(self):
-        """Respect Nominatim rate limit (1 req/sec)"""
-        elapsed = time.time() - self.last_request
-        if elapsed < 1.0:
-            time.sleep(1.0 - elapsed)
+        """Respect Nominatim rate limit (1 req/sec), across threads"""
+        with self._bucket_lock:
+            now = time.time()
+            wait = max(0.0, self._next_slot - now)
+            self._next_slot = max(now, self._next_slot) + 1.0
+        # Sleep outside the lock; each caller already owns its own slot
+        if wait:
+            time.sleep(wait)
         self.last_request = time.time()
     
     def geocode(self, location_name, state="India"):
@@ -61,50 +128,83 @@ class NominatimGeocoder:
         """
         # Check cache first
         cache_key = f"{location_name}, {state}"
-        if cache_key in self.cache:
-            return tuple(self.cache[cache_key]) if self.cache[cache_key] else None
+        found, coords = self._cache_get(cache_key)
+        if found:
+            return coords
         
         # Build query
         query = f"{location_name}, {state}, India"
-        params = urllib.parse.urlencode({
+        params = {
             'q': query,
             'format': 'json',
             'limit': 1,
             'addressdetails': 0
-        })
-        
-        url = f"{self.BASE_URL}?{params}"
+        }
         
         try:
             self._rate_limit()
             
-            req = urllib.request.Request(
-                url,
-                headers={'User-Agent': 'PetroleumIntel/1.0 (lead-scoring-system)'}
-            )
-            
-            with urllib.request.urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode())
+            response = self.session.get(self.BASE_URL, params=params, timeout=10)
+            response.raise_for_status()
+            data = response.json()
             
             if data and len(data) > 0:
                 lat = float(data[0]['lat'])
                 lon = float(data[0]['lon'])
                 coords = (lat, lon)
-                self.cache[cache_key] = list(coords)
-                self._save_cache()
+                self._cache_put(cache_key, coords)
                 return coords
             else:
-                self.cache[cache_key] = None
-                self._save_cache()
+                self._cache_put(cache_key, None)
                 return None
                 
         except Exception as e:
             print(f"  Geocoding error for {location_name}: {e}")
             return None
 
+    
+    def geocode_many(self, pairs, workers=4):
+        """
+        Geocode many (location_name, state) pairs concurrently.
+        
+        Cache hits return immediately; network lookups are still paced at
+        1 req/sec by the shared token bucket, but response handling overlaps
+        with the wait for the next slot.
+        
+        Returns:
+            List of (latitude, longitude) tuples or None, in input order
+        """
+        pairs = list(pairs)
+        unique = list(dict.fromkeys(pairs))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            resolved = dict(zip(unique, ex.map(lambda pair: self.geocode(*pair), unique)))
+        return [resolved[pair] for pair in pairs]
+
+
+# Geocoder shared by all callers (built once, on first use)
+_nominatim_instance = None
+_nominatim_lock = threading.Lock()
+
+
+def get_nominatim_geocoder():
+    """Get or create the shared geocoder; its pending cache entries are committed at exit"""
+    global _nominatim_instance
+    if _nominatim_instance is None:
+        with _nominatim_lock:
+            if _nominatim_instance is None:
+                _nominatim_instance = NominatimGeocoder()
+    return _nominatim_instance
+
+
+@atexit.register
+def _flush_shared_geocoder():
+    """Commit the shared geocoder's pending cache entries"""
+    if _nominatim_instance is not None:
+        _nominatim_instance.flush()
+
 
 if __name__ == "__main__":
-    geocoder = NominatimGeocoder()
+    geocoder = get_nominatim_geocoder()
     
     # Test with Indian locations
     test_locations = [
@@ -118,8 +218,7 @@ if __name__ == "__main__":
     print("Testing Nominatim Geocoder (NO API KEY NEEDED):")
     print("=" * 60)
     
-    for location, state in test_locations:
-        coords = geocoder.geocode(location, state)
+    for (location, state), coords in zip(test_locations, geocoder.geocode_many(test_locations)):
         print(f"{location}, {state} → {coords}")
     
     print("\n✓ Geocoding completed without any API key!")
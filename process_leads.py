@@ -5,17 +5,29 @@ Input: raw_data.csv (unified raw data from all sources)
 Output: leads_export.csv (filtered leads with metadata and keywords)
 """
 
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
 import re
 import json
 
+# Rows per read_csv chunk; peak memory is bounded by one chunk, not the file
+CHUNK_SIZE = 50_000
+
+# Low-cardinality columns read as categoricals: one copy of each string per chunk
+CATEGORY_COLUMNS = ['source_system', 'sector', 'state', 'status']
+
+# Column order of leads_export.csv
+EXPORT_COLUMNS = [
+    'id', 'company_name', 'signal_type', 'source', 'source_url',
+    'keywords', 'sector', 'product_match', 'confidence', 'status',
+    'state', 'location', 'project_name', 'description', 'discovered_at'
+]
+
 class LeadProcessor:
     def __init__(self, base_path):
         self.base_path = Path(base_path)
-        self.raw_data = None
-        self.processed_leads = []
         
         # Signal type classification
         self.signal_patterns = {
@@ -28,6 +40,17 @@ class LeadProcessor:
             'Financial Announcement': [r'CAPEX', r'Board approves', r'expansion project']
         }
         
+        # Signal type fallback by source system when no pattern matches
+        self.source_signal_types = {
+            'parivesh': 'Environmental Clearance',
+            'gem': 'Government Tender',
+            'bse': 'Financial Announcement',
+            'mca': 'New Company Registration',
+            'care': 'Credit Rating',
+            'crisil': 'Credit Rating',
+            'icra': 'Credit Rating',
+        }
+        
         # Keyword extraction patterns
         self.keyword_patterns = {
             'industrial_machinery': [
@@ -44,173 +67,178 @@ class LeadProcessor:
             ]
         }
         
-    def load_raw_data(self):
-        """Load raw_data.csv"""
-        print("=" * 70)
-        print("LOADING RAW DATA")
-        print("=" * 70)
+        # Default products by sector; the first sector code found in the
+        # upper-cased sector wins
+        self.sector_products = {
+            'MIN': ['Diesel', 'Lubricants'],
+            'INFRA': ['Bitumen', 'Diesel', 'HSD'],
+            'IND': ['Furnace Oil', 'Diesel', 'Lubricants'],
+        }
         
+        # Keyword hints for product inference
+        self.product_patterns = {
+            'Bitumen': r'bitumen|VG-30|road',
+            'Diesel': r'diesel|HSD|fuel',
+            'Furnace Oil': r'furnace oil|boiler|thermal',
+            'Lubricants': r'lubricant|lubrication',
+        }
+        
+        # Compile once: one alternation per signal category (categories keep
+        # their priority order), one regex per keyword so each hit is reported.
+        # Texts are lower-cased before matching, so the patterns are too and
+        # no IGNORECASE is needed (the patterns are plain words, no escapes)
+        self._signal_res = {
+            signal: re.compile('|'.join(patterns).lower())
+            for signal, patterns in self.signal_patterns.items()
+        }
+        self._keyword_res = [
+            (category, pattern, re.compile(pattern.lower()))
+            for category, patterns in self.keyword_patterns.items()
+            for pattern in patterns
+        ]
+        self._product_res = {
+            product: re.compile(pattern.lower())
+            for product, pattern in self.product_patterns.items()
+        }
+        self._keywords_json = {}  # keyword hit tuple -> rendered JSON
+        
+    def raw_data_path(self):
+        """Path to raw_data.csv (raises if it is missing)"""
         raw_data_path = self.base_path / 'data' / 'raw_data.csv'
         
         if not raw_data_path.exists():
             raise FileNotFoundError(f"raw_data.csv not found at {raw_data_path}")
         
-        self.raw_data = pd.read_csv(raw_data_path, encoding='utf-8')
-        print(f"✓ Loaded {len(self.raw_data)} raw records\n")
-        
-    def classify_signal_type(self, record):
-        """Classify the signal type based on content"""
-        text = f"{record.get('project_name', '')} {record.get('description', '')} {record.get('status', '')}".lower()
-        
-        for signal, patterns in self.signal_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    return signal
-        
-        # Default based on source system
-        source = record.get('source_system', '').lower()
-        if source == 'parivesh':
-            return 'Environmental Clearance'
-        elif source == 'gem':
-            return 'Government Tender'
-        elif source == 'bse':
-            return 'Financial Announcement'
-        elif source == 'mca':
-            return 'New Company Registration'
-        elif source in ['care', 'crisil', 'icra']:
-            return 'Credit Rating'
-        
-        return 'Other'
+        return raw_data_path
+        
+    def _render_keywords(self, hits):
+        """
+        JSON of the matched keywords by category. There are only a few
+        distinct hit combinations, so each is encoded once and reused.
+        """
+        rendered = self._keywords_json.get(hits)
+        if rendered is None:
+            keywords = {}
+            for (category, pattern, _), hit in zip(self._keyword_res, hits):
+                if hit:
+                    keywords.setdefault(category, []).append(pattern)
+            rendered = json.dumps(keywords) if keywords else '{}'
+            self._keywords_json[hits] = rendered
+        return rendered
     
-    def extract_keywords(self, record):
-        """Extract and categorize keywords from description"""
-        text = f"{record.get('project_name', '')} {record.get('description', '')}".lower()
-        keywords = {}
-        
-        for category, patterns in self.keyword_patterns.items():
-            matches = []
-            for pattern in patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    matches.append(pattern)
-            if matches:
-                keywords[category] = matches
-        
-        return json.dumps(keywords) if keywords else '{}'
+    @staticmethod
+    def _column(df, name, default=''):
+        """Raw column, or a constant Series if the CSV does not have it"""
+        return df[name] if name in df.columns else pd.Series(default, index=df.index, dtype=object)
     
-    def infer_product_match(self, record):
-        """Infer product matches based on sector and keywords"""
-        sector = record.get('sector', '').upper()
-        text = f"{record.get('project_name', '')} {record.get('description', '')}".lower()
-        
-        products = set()
-        
-        # Sector-based inference
-        if 'MIN' in sector or 'MINING' in sector.upper():
-            products.update(['Diesel', 'Lubricants'])
-        elif 'INFRA' in sector:
-            products.update(['Bitumen', 'Diesel', 'HSD'])
-        elif 'IND' in sector or 'INDUSTRIAL' in sector.upper():
-            products.update(['Furnace Oil', 'Diesel', 'Lubricants'])
-        
-        # Keyword-based inference
-        if re.search(r'bitumen|VG-30|road', text, re.IGNORECASE):
-            products.add('Bitumen')
-        if re.search(r'diesel|HSD|fuel', text, re.IGNORECASE):
-            products.add('Diesel')
-        if re.search(r'furnace oil|boiler|thermal', text, re.IGNORECASE):
-            products.add('Furnace Oil')
-        if re.search(r'lubricant|lubrication', text, re.IGNORECASE):
-            products.add('Lubricants')
-        
-        return ', '.join(sorted(products)) if products else ''
+    @classmethod
+    def _text(cls, df, *names):
+        """Lower-cased 'a b c' text of the given columns (missing cells read as 'nan', like str())"""
+        parts = [cls._column(df, name).astype(object).where(lambda c: c.notna(), 'nan').astype(str)
+                 for name in names]
+        text = parts[0]
+        for part in parts[1:]:
+            text = text + ' ' + part
+        return text.str.lower()
     
-    def calculate_confidence(self, record):
-        """Calculate confidence score based on data completeness"""
-        score = 0.0
-        
-        # Check key fields
-        if record.get('company_name'):
-            score += 20
-        if record.get('project_name'):
-            score += 20
-        if record.get('description'):
-            score += 20
-        if record.get('source_url'):
-            score += 20
-        if record.get('state'):
-            score += 10
-        if record.get('sector') and record.get('sector') != 'Unknown':
-            score += 10
-        
-        return score
+    @staticmethod
+    def _truthy(df, name):
+        """Vectorised `if record.get(name)` (a missing column counts as falsy)"""
+        if name not in df.columns:
+            return pd.Series(False, index=df.index)
+        return df[name].astype(object).astype(bool)
     
-    def process_records(self):
-        """Process each raw record into enriched lead"""
-        print("=" * 70)
-        print("PROCESSING AND ENRICHING LEADS")
-        print("=" * 70)
-        
-        for _, row in self.raw_data.iterrows():
-            # Create enriched lead record
-            lead = {
-                'id': row['id'],
-                'company_name': row.get('company_name', ''),
-                'signal_type': self.classify_signal_type(row),
-                'source': row.get('source_system', ''),
-                'source_url': row.get('source_url', ''),
-                'keywords': self.extract_keywords(row),
-                'sector': row.get('sector', 'Unknown'),
-                'product_match': self.infer_product_match(row),
-                'confidence': self.calculate_confidence(row),
-                'status': row.get('status', 'NEW'),
-                'state': row.get('state', ''),
-                'location': row.get('location', ''),
-                'project_name': row.get('project_name', ''),
-                'description': row.get('description', ''),
-                'discovered_at': row.get('discovered_at', '')
-            }
-            
-            self.processed_leads.append(lead)
-        
-        print(f"✓ Processed {len(self.processed_leads)} leads\n")
+    @staticmethod
+    def _labels_from_masks(masks, render):
+        """
+        Combine boolean columns into one label per row: rows are keyed by
+        their match bitmask and render() runs once per distinct combination.
+        """
+        codes = np.zeros(len(masks[0]), dtype=np.int64)
+        for bit, mask in enumerate(masks):
+            codes |= mask.to_numpy(dtype=bool).astype(np.int64) << bit
+        labels = {code: render([bool(code >> bit & 1) for bit in range(len(masks))])
+                  for code in np.unique(codes)}
+        return [labels[code] for code in codes]
     
-    def export_leads(self):
-        """Save processed leads to leads_export.csv"""
-        print("=" * 70)
-        print("EXPORTING PROCESSED LEADS")
-        print("=" * 70)
+    def process_records(self, df):
+        """Enrich a frame of raw records, column-wise; returns it in EXPORT_COLUMNS order"""
+        text = self._text(df, 'project_name', 'description')
+        signal_text = text + ' ' + self._text(df, 'status')
         
-        if not self.processed_leads:
-            print("⚠ No leads to export!")
-            return
+        # Signal type: first category with any matching pattern, else by source system
+        conditions = [signal_text.str.contains(regex) for regex in self._signal_res.values()]
+        source = self._column(df, 'source_system').astype(object).fillna('').astype(str).str.lower()
+        fallback = source.map(self.source_signal_types).fillna('Other')
+        signal_type = np.select(conditions, list(self.signal_patterns), default=fallback.to_numpy())
         
-        df = pd.DataFrame(self.processed_leads)
+        # Keywords: every matching pattern, grouped by category, as JSON
+        keyword_masks = [text.str.contains(regex) for _, _, regex in self._keyword_res]
+        keywords = self._labels_from_masks(keyword_masks, lambda hits: self._render_keywords(tuple(hits)))
         
-        # Reorder columns
-        column_order = [
-            'id', 'company_name', 'signal_type', 'source', 'source_url',
-            'keywords', 'sector', 'product_match', 'confidence', 'status',
-            'state', 'location', 'project_name', 'description', 'discovered_at'
-        ]
+        # Product match: sector defaults plus keyword hints
+        sector = self._column(df, 'sector').astype(object).fillna('').astype(str).str.upper()
+        product_masks = {product: text.str.contains(regex) for product, regex in self._product_res.items()}
+        unmatched = pd.Series(True, index=df.index)
+        for code, products in self.sector_products.items():
+            in_sector = unmatched & sector.str.contains(code, regex=False)
+            unmatched &= ~in_sector
+            for product in products:
+                product_masks[product] = product_masks.get(product, False) | in_sector
+        product_names = sorted(product_masks)
+        product_match = self._labels_from_masks(
+            [product_masks[name] for name in product_names],
+            lambda hits: ', '.join(name for name, hit in zip(product_names, hits) if hit),
+        )
         
-        df = df[column_order]
+        # Confidence: data completeness
+        sector_raw = self._column(df, 'sector', None)
+        confidence = (
+            self._truthy(df, 'company_name') * 20.0
+            + self._truthy(df, 'project_name') * 20
+            + self._truthy(df, 'description') * 20
+            + self._truthy(df, 'source_url') * 20
+            + self._truthy(df, 'state') * 10
+            + (self._truthy(df, 'sector') & (sector_raw != 'Unknown')) * 10
+        )
         
-        # Save to CSV
-        output_path = self.base_path / 'data' / 'leads_export.csv'
-        df.to_csv(output_path, index=False, encoding='utf-8-sig')
-        
-        print(f"✓ Saved {len(df)} leads to {output_path}\n")
-        
-        # Summary statistics
+        return pd.DataFrame({
+            'id': df['id'],
+            'company_name': self._column(df, 'company_name'),
+            'signal_type': signal_type,
+            'source': self._column(df, 'source_system'),
+            'source_url': self._column(df, 'source_url'),
+            'keywords': keywords,
+            'sector': self._column(df, 'sector', 'Unknown'),
+            'product_match': product_match,
+            'confidence': confidence,
+            'status': self._column(df, 'status', 'NEW'),
+            'state': self._column(df, 'state'),
+            'location': self._column(df, 'location'),
+            'project_name': self._column(df, 'project_name'),
+            'description': self._column(df, 'description'),
+            'discovered_at': self._column(df, 'discovered_at'),
+        }, columns=EXPORT_COLUMNS)
+    
+    @staticmethod
+    def _add_counts(counts, column):
+        """Running value_counts across chunks"""
+        chunk_counts = column.value_counts()
+        if counts is None:
+            return chunk_counts
+        return pd.concat([counts, chunk_counts]).groupby(level=0, sort=False).sum()
+    
+    def print_summary(self, total, signal_counts, source_counts, confidence_sum):
+        """Summary statistics over everything exported"""
         print("=" * 70)
         print("SUMMARY STATISTICS")
         print("=" * 70)
-        print(f"Total leads exported: {len(df)}")
+        print(f"Total leads exported: {total}")
         print(f"\nBy Signal Type:")
-        print(df['signal_type'].value_counts())
+        print(signal_counts.sort_values(ascending=False, kind='stable'))
         print(f"\nBy Source:")
-        print(df['source'].value_counts())
-        print(f"\nAverage Confidence Score: {df['confidence'].mean():.1f}")
+        print(source_counts.sort_values(ascending=False, kind='stable'))
+        print(f"\nAverage Confidence Score: {confidence_sum / total:.1f}")
         
     def run(self):
         """Execute full processing pipeline"""
@@ -219,9 +247,44 @@ class LeadProcessor:
         print("=" * 70)
         print(f"Timestamp: {datetime.now().isoformat()}\n")
         
-        self.load_raw_data()
-        self.process_records()
-        self.export_leads()
+        raw_data_path = self.raw_data_path()
+        output_path = self.base_path / 'data' / 'leads_export.csv'
+        
+        print("=" * 70)
+        print("PROCESSING AND EXPORTING LEADS")
+        print("=" * 70)
+        
+        # Stream raw_data.csv in chunks; each enriched chunk goes straight to
+        # the export through one handle so the utf-8-sig BOM is written once
+        total = 0
+        confidence_sum = 0.0
+        signal_counts = source_counts = None
+        out = None
+        try:
+            reader = pd.read_csv(raw_data_path, encoding='utf-8', chunksize=CHUNK_SIZE,
+                                 dtype={col: 'category' for col in CATEGORY_COLUMNS})
+            for chunk in reader:
+                leads = self.process_records(chunk)
+                if leads.empty:
+                    continue
+                if out is None:
+                    out = open(output_path, 'w', encoding='utf-8-sig', newline='')
+                leads.to_csv(out, index=False, header=total == 0)
+                
+                total += len(leads)
+                confidence_sum += leads['confidence'].sum()
+                signal_counts = self._add_counts(signal_counts, leads['signal_type'])
+                source_counts = self._add_counts(source_counts, leads['source'])
+                print(f"  Processed {total} leads...")
+        finally:
+            if out is not None:
+                out.close()
+        
+        if not total:
+            print("⚠ No leads to export!")
+        else:
+            print(f"✓ Saved {total} leads to {output_path}\n")
+            self.print_summary(total, signal_counts, source_counts, confidence_sum)
         
         print("\n" + "=" * 70)
         print("✓ LEAD PROCESSING COMPLETE!")
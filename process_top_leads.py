@@ -6,8 +6,18 @@ This bypasses the pandas import issue entirely.
 """
 
 import csv
+import heapq
 from pathlib import Path
-from operator import itemgetter
+
+
+def _confidence(row, conf_idx):
+    """Confidence of a CSV row as a float (0.0 if missing or not a number)"""
+    if conf_idx is None or conf_idx >= len(row):
+        return 0.0
+    try:
+        return float(row[conf_idx])
+    except ValueError:
+        return 0.0
 
 
 def process_top_leads(input_csv: str, output_csv: str, top_n: int = 100):
@@ -15,37 +25,26 @@ def process_top_leads(input_csv: str, output_csv: str, top_n: int = 100):
     
     print(f"Loading leads from {input_csv}...")
     
-    # Read all leads
-    leads = []
+    # Read all leads positionally; only the confidence column is needed
     with open(input_csv, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Convert confidence to float for sorting
-            try:
-                row['confidence_float'] = float(row.get('confidence', 0))
-            except:
-                row['confidence_float'] = 0.0
-            leads.append(row)
+        reader = csv.reader(f)
+        header = next(reader, [])
+        conf_idx = header.index('confidence') if 'confidence' in header else None
+        leads = [row for row in reader if row]
     
     print(f"Total leads loaded: {len(leads)}")
     
     # Sort by confidence (descending) and take top N
-    leads_sorted = sorted(leads, key=itemgetter('confidence_float'), reverse=True)
-    top_leads = leads_sorted[:top_n]
+    top_leads = heapq.nlargest(top_n, leads, key=lambda row: _confidence(row, conf_idx))
     
     print(f"Processing top {len(top_leads)} leads...")
     
     # Write to output
     if top_leads:
-        fieldnames = [k for k in top_leads[0].keys() if k != 'confidence_float']
-        
         with open(output_csv, 'w', newline='', encoding='utf-8-sig') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for lead in top_leads:
-                # Remove the helper field
-                lead_copy = {k: v for k, v in lead.items() if k != 'confidence_float'}
-                writer.writerow(lead_copy)
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(top_leads)
     
     print(f"✓ Saved {len(top_leads)} top leads to {output_csv}")
     return len(top_leads)
@@ -12,22 +12,59 @@ Features:
 """
 
 import json
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from math import radians, cos, sin, asin, sqrt
+import threading
 import time
 
+import numpy as np
+
+# Geocoder shared by every ProximityService (built once, on first use)
+_geocoder_instance = None
+_geocoder_lock = threading.Lock()
+
+
+def get_geocoder():
+    """Get or create the shared geocoder with its pre-compiled database"""
+    global _geocoder_instance
+    if _geocoder_instance is None:
+        with _geocoder_lock:
+            if _geocoder_instance is None:
+                from geocode_proximity import GeographicProximityScorer
+                _geocoder_instance = GeographicProximityScorer()
+    return _geocoder_instance
+
+
 class ProximityService:
     """Service for finding nearest HPCL officers to project locations"""
     
+    # "location, state" -> coords, shared across instances so a warm
+    # process does not geocode the same place twice
+    geocode_cache: Dict[str, Optional[Tuple[float, float]]] = {}
+    
+    # Locations per distance matrix in batch_find_nearest_officers
+    BATCH_ROWS = 4096
+    
     def __init__(self, officers_file: str = "config/hpcl_officers.json"):
         """Initialize proximity service with officer data"""
         self.officers = self._load_officers(officers_file)
-        self.geocode_cache = {}
+        for officer in self.officers:
+            officer['_display_name'] = self._display_name(officer)
         self.last_geocode_request = 0
         
-        # Initialize geocoder (lazy loading)
-        self._geocoder = None
+        # Officer coordinates resolved once, as parallel arrays in radians
+        # (officers that cannot be geocoded are left out)
+        self._officer_refs: List[Dict] = []
+        self._officer_lats = np.empty(0)
+        self._officer_lons = np.empty(0)
+        # sin/cos of officer latitudes never change, so precompute them
+        self._officer_sinlat = np.empty(0)
+        self._officer_coslat = np.empty(0)
+        # Lower-cased state -> indices into the arrays above
+        self._officers_by_state: Dict[str, np.ndarray] = {}
+        self._load_officer_coords()
         
     def _load_officers(self, filepath: str) -> List[Dict]:
         """Load HPCL officers from JSON file"""
@@ -35,12 +72,49 @@ class ProximityService:
             data = json.load(f)
         return data.get('depots', [])
     
+    @staticmethod
+    def _display_name(officer: Dict) -> str:
+        """Officer name, or 'Role - Location' when the name is empty or N/A"""
+        officer_name = officer.get('name', '').strip()
+        if not officer_name or officer_name == 'N/A':
+            role = officer.get('role', 'Officer')
+            location = officer.get('location', 'HPCL')
+            officer_name = f"{role} - {location}"
+        return officer_name
+    
+    def _load_officer_coords(self):
+        """Geocode every officer once and store the results in the parallel arrays"""
+        lats, lons = [], []
+        for officer in self.officers:
+            coords = self.geocode_officer_location(officer)
+            if coords:
+                self._officer_refs.append(officer)
+                lats.append(coords[0])
+                lons.append(coords[1])
+        self._officer_lats = np.radians(np.array(lats, dtype=float))
+        self._officer_lons = np.radians(np.array(lons, dtype=float))
+        self._officer_sinlat = np.sin(self._officer_lats)
+        self._officer_coslat = np.cos(self._officer_lats)
+        
+        by_state = defaultdict(list)
+        for i, officer in enumerate(self._officer_refs):
+            by_state[officer.get('state', '').lower()].append(i)
+        self._officers_by_state = {state: np.array(idx) for state, idx in by_state.items()}
+    
+    def _distance_vec(self, plat, plon, idx=slice(None)) -> np.ndarray:
+        """
+        Great-circle distance (km) from a point, in radians, to the officers at idx,
+        by the spherical law of cosines (one transcendental per officer).
+        With (L, 1) arrays of points the result is an (L, len(idx)) matrix.
+        """
+        cos_d = (np.sin(plat) * self._officer_sinlat[idx]
+                 + np.cos(plat) * self._officer_coslat[idx] * np.cos(self._officer_lons[idx] - plon))
+        # Clip: rounding can push cos_d just past 1 for coincident points
+        return 6371 * np.arccos(np.clip(cos_d, -1.0, 1.0))
+    
     def _get_geocoder(self):
         """Lazy load geocoder with pre-compiled database"""
-        if self._geocoder is None:
-            from geocode_proximity import GeographicProximityScorer
-            self._geocoder = GeographicProximityScorer()
-        return self._geocoder
+        return get_geocoder()
     
     def haversine_distance(self, lat1: float, lon1: float, 
                           lat2: float, lon2: float) -> float:
@@ -139,43 +213,39 @@ class ProximityService:
         min_distance = float('inf')
         nearest_officer = None
         
-        for officer in self.officers:
-            officer_coords = self.geocode_officer_location(officer)
-            
-            if not officer_coords:
-                continue
-            
-            officer_lat, officer_lon = officer_coords
-            distance = self.haversine_distance(
-                project_lat, project_lon,
-                officer_lat, officer_lon
-            )
-            
-            if distance < min_distance:
-                min_distance = distance
-                nearest_officer = officer
+        if self._officer_refs:
+            # Only officers in the project's state, nationwide if it has none
+            candidates = self._state_candidates(project_state)
+            dists = self._distance_vec(radians(project_lat), radians(project_lon), candidates)
+            best = int(np.argmin(dists))
+            min_distance = float(dists[best])
+            nearest_officer = self._officer_refs[candidates[best]]
         
         if nearest_officer and min_distance <= max_radius_km:
-            # Use descriptive name if actual name is empty
-            officer_name = nearest_officer.get('name', '').strip()
-            if not officer_name or officer_name == 'N/A':
-                # Create descriptive identifier: Role @ Location
-                role = nearest_officer.get('role', 'Officer')
-                location = nearest_officer.get('location', 'HPCL')
-                officer_name = f"{role} - {location}"
-            
-            return {
-                'officer_name': officer_name,
-                'officer_phone': nearest_officer.get('phone', 'N/A'),
-                'officer_email': nearest_officer.get('email', 'N/A'),
-                'officer_address': nearest_officer.get('address', 'N/A'),
-                'officer_role': nearest_officer.get('role', 'N/A'),
-                'distance_km': round(min_distance, 2)
-            }
+            return self._officer_result(nearest_officer, round(min_distance, 2))
         
         # Fallback to state-based matching
         return self._find_officer_by_state(project_state)
     
+    def _state_candidates(self, state: str) -> np.ndarray:
+        """Indices of geocoded officers in a state, or of all of them if it has none"""
+        candidates = self._officers_by_state.get(state.lower())
+        if candidates is None:
+            candidates = np.arange(len(self._officer_refs))
+        return candidates
+    
+    @staticmethod
+    def _officer_result(officer: Dict, distance_km: Optional[float]) -> Dict:
+        """Result dict for an officer match"""
+        return {
+            'officer_name': officer['_display_name'],
+            'officer_phone': officer.get('phone', 'N/A'),
+            'officer_email': officer.get('email', 'N/A'),
+            'officer_address': officer.get('address', 'N/A'),
+            'officer_role': officer.get('role', 'N/A'),
+            'distance_km': distance_km
+        }
+    
     def _find_officer_by_state(self, state: str) -> Optional[Dict]:
         """
         Fallback: Find any officer in the same state
@@ -188,21 +258,8 @@ class ProximityService:
         """
         for officer in self.officers:
             if officer.get('state', '').lower() == state.lower():
-                # Use descriptive name if actual name is empty
-                officer_name = officer.get('name', '').strip()
-                if not officer_name or officer_name == 'N/A':
-                    role = officer.get('role', 'Officer')
-                    location = officer.get('location', 'HPCL')
-                    officer_name = f"{role} - {location}"
-                
-                return {
-                    'officer_name': officer_name,
-                    'officer_phone': officer.get('phone', 'N/A'),
-                    'officer_email': officer.get('email', 'N/A'),
-                    'officer_address': officer.get('address', 'N/A'),
-                    'officer_role': officer.get('role', 'N/A'),
-                    'distance_km': None  # Unknown distance for state fallback
-                }
+                # Unknown distance for state fallback
+                return self._officer_result(officer, None)
         
         # No officer found in state
         return {
@@ -216,23 +273,50 @@ class ProximityService:
     
     def batch_find_nearest_officers(self, 
                                    locations: List[Tuple[str, str]],
-                                   progress_callback=None) -> List[Optional[Dict]]:
+                                   progress_callback=None,
+                                   max_radius_km: float = 500) -> List[Optional[Dict]]:
         """
         Batch process multiple locations to find nearest officers
         
         Args:
             locations: List of (location, state) tuples
             progress_callback: Optional callback for progress updates
+            max_radius_km: Maximum search radius in kilometers
             
         Returns:
             List of officer dictionaries
         """
-        results = []
         total = len(locations)
         
+        # Geocode each distinct location once
+        coords = {pair: self.geocode_location(*pair) for pair in dict.fromkeys(locations)}
+        
+        # Group geocoded locations by state and solve each group with one
+        # distance matrix (at most BATCH_ROWS locations per matrix)
+        by_state = defaultdict(list)
+        for pair, point in coords.items():
+            if point and self._officer_refs:
+                by_state[pair[1].lower()].append(pair)
+        
+        resolved = {}
+        for state, pairs in by_state.items():
+            candidates = self._state_candidates(state)
+            for start in range(0, len(pairs), self.BATCH_ROWS):
+                block = pairs[start:start + self.BATCH_ROWS]
+                points = np.radians(np.array([coords[pair] for pair in block], dtype=float))
+                dists = self._distance_vec(points[:, :1], points[:, 1:], candidates)
+                best = dists.argmin(axis=1)
+                for pair, j, dist in zip(block, best, dists[np.arange(len(block)), best]):
+                    if dist <= max_radius_km:
+                        resolved[pair] = self._officer_result(self._officer_refs[candidates[j]],
+                                                              round(float(dist), 2))
+        
+        results = []
         for i, (location, state) in enumerate(locations, 1):
-            officer = self.find_nearest_officer(location, state)
-            results.append(officer)
+            officer = resolved.get((location, state))
+            if officer is None:
+                officer = self._find_officer_by_state(state)
+            results.append(dict(officer))
             
             if progress_callback and i % 10 == 0:
                 progress_callback(i, total)
@@ -4,11 +4,12 @@ Showcases Product-Need Inference, Confidence Scoring, and Geospatial Routing.
 """
 import sys
 from datetime import datetime
+from pathlib import Path
 from rich.console import Console
 from rich.table import Table
 
 # Add project root to path
-sys.path.append(str(__file__).rsplit('\\', 2)[0])
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from intelligence.inference import ProductInferenceEngine
 from intelligence.scorer import LeadScorer
@@ -54,37 +55,39 @@ def run_pipeline():
     table.add_column("Score", justify="right")
     table.add_column("Routing", style="magenta")
     
-    for signal in test_signals:
-        text = signal["text"]
-        
-        # 1. Product Inference
-        inference = inference_engine.analyze_signal(text)
-        products = inference["products"]
-        primary_product = products[0] if products else {"product": "Unknown", "confidence": 0}
-        
-        # 2. Location & Routing
-        route_info = router.route_lead(text)
-        
-        # 3. Scoring (Weighted)
-        lead_data = {
+    # Infer and route every signal first, then score them in one batch
+    now = datetime.now()
+    inferences = [inference_engine.analyze_signal(signal["text"]) for signal in test_signals]
+    routes = [router.route_lead(signal["text"]) for signal in test_signals]
+    scores = scorer.score_batch([
+        {
             "signal_type": signal["source"],
-            "description": text,
-            "raw_data": text,
-            "discovered_at": datetime.now(),
+            "description": signal["text"],
+            "raw_data": signal["text"],
+            "discovered_at": now,
         }
-        score = scorer.score_lead(lead_data)
+        for signal in test_signals
+    ])
+    
+    rows = []
+    for signal, inference, route_info, score in zip(test_signals, inferences, routes, scores):
+        primary_product = inference["products"][0]
         
         # Display
-        product_str = f"{primary_product['product']}\n({primary_product.get('reason', '')})"
-        route_str = f"{route_info['territory']}\n({route_info.get('sales_officer_id', 'Unassigned')})"
+        product_str = f"{primary_product['product']}\n({primary_product['reason']})"
+        route_str = f"{route_info['territory']}\n({route_info['sales_officer_id'] or 'Unassigned'})"
         
-        table.add_row(
-            text,
+        rows.append((
+            signal["text"],
             product_str,
             f"{primary_product['confidence']}%",
             f"{score}",
             route_str
-        )
+        ))
+    
+    # Fill the table in one go once every row is known
+    for row in rows:
+        table.add_row(*row)
         
     console.print(table)
     
@@ -11,18 +11,36 @@ Usage:
     python run_full_pipeline.py
 """
 
+import importlib
 import sys
-<<<<<<< HEAD
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-# Run filter_leads.py first
-print("=" * 70)
-print("STEP 1: FILTERING AND SCORING LEADS")
-=======
-import subprocess
-from pathlib import Path
 
-PYTHON_EXE = sys.executable
+def warm_officer_geodata():
+    """Geocode the officer list so STEP 4 starts with a warm geocoder and cache"""
+    from proximity_service import ProximityService
+    ProximityService()
+
+
+# Modules behind STEP 1-4, imported only when their step runs
+STEP_MODULES = ("aggregate_raw_data", "process_leads", "filter_leads", "map_officers_to_leads")
+
+
+def prefetch_step_modules():
+    """Import the step modules (pandas and friends) ahead of time"""
+    for name in STEP_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass  # The step's own import reports the error
+
+
+# Officer geodata and the step imports do not depend on the scraped data,
+# so do them in the background while the seeder runs
+prefetch = ThreadPoolExecutor(max_workers=2)
+officer_warmup = prefetch.submit(warm_officer_geodata)
+prefetch.submit(prefetch_step_modules)
 
 # 0. Run Scrapers & Export Fresh Data
 print("=" * 70)
@@ -32,13 +50,16 @@ print()
 
 # A. Run Seeder/Scraper (Simulating or Running Real Scrapers)
 print(">> Running Historical Data Seeder (Simulating Parivesh/GeM/BSE)...")
-# Using seed_historical_data.py as the primary scraper for now
-subprocess.run([PYTHON_EXE, "seed_historical_data.py"], check=False)
+# Using seed_historical_data.py as the primary scraper for now.
+# Seeder and export run in this process and share the get_db() connection
+from seed_historical_data import seed_historical_data
+seed_historical_data()
 
 # B. Export to fresh_intelligence.csv
 print("\n>> Exporting fresh data from database...")
 # Export to data/fresh_intelligence.csv
-subprocess.run([PYTHON_EXE, "main.py", "export", "--output", "fresh_intelligence"], check=True)
+from main import export_leads
+export_leads(output="fresh_intelligence")
 print("✓ Fresh intelligence data exported.")
 
 # 1. Aggregate Raw Data
@@ -62,25 +83,25 @@ process_main()
 # 3. Filter Leads (Score)
 print("\n" + "=" * 70)
 print("STEP 3: SCORING LEADS")
->>>>>>> 33a70aae55287a0a0bf390e82acc37e62424e38c
 print("=" * 70)
 print()
 
 from filter_leads import main as filter_main
 filter_main()
 
-<<<<<<< HEAD
-# Then map officers
-print("\n" + "=" * 70)
-print("STEP 2: MAPPING HPCL OFFICERS TO LEADS")
-=======
 # 4. Map Officers
 print("\n" + "=" * 70)
 print("STEP 4: MAPPING HPCL OFFICERS TO LEADS")
->>>>>>> 33a70aae55287a0a0bf390e82acc37e62424e38c
 print("=" * 70)
 print()
 
+# Join the background warm-up; if it failed, the mapper geocodes officers itself
+try:
+    officer_warmup.result()
+except Exception as e:
+    print(f"⚠ Officer geodata prefetch failed ({e}), loading it now")
+prefetch.shutdown()
+
 from map_officers_to_leads import main as officer_main
 result = officer_main()
 
@@ -89,11 +110,8 @@ print("✅ COMPLETE PIPELINE FINISHED SUCCESSFULLY!")
 print("=" * 70)
 print()
 print("Your filtered_dataset.csv now includes:")
-<<<<<<< HEAD
-=======
 print("  ✓ Unified data from environmental & intelligence sources")
 print("  ✓ Metadata enrichment (Signal Type, Keywords)")
->>>>>>> 33a70aae55287a0a0bf390e82acc37e62424e38c
 print("  ✓ Lead scoring and prioritization")
 print("  ✓ Product recommendations")
 print("  ✓ HPCL officer contact information")
@@ -1,7 +1,84 @@
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, List, Any, Iterable, Iterator, Optional, Tuple
+
+from .base_scraper import Scraper
 from .rating_scraper import RatingScraper
 from .mca_scraper import MCAScraper
 
-SCRAPER_REGISTRY = {
+logger = logging.getLogger(__name__)
+
+# Source name -> zero-argument scraper factory
+SCRAPER_REGISTRY: Dict[str, Callable[[], Scraper]] = {
     "rating_agency": RatingScraper,
     "mca_registry": MCAScraper
 }
+
+# (source name, batch of signals or None, error or None); see iter_scraped_batches
+ScrapedBatch = Tuple[str, Optional[List[Dict[str, Any]]], Optional[Exception]]
+
+
+def _put(out: "queue.Queue", item: ScrapedBatch, stop: threading.Event) -> bool:
+    """Put item on the queue, giving up once the consumer has stopped."""
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _scrape_into(name: str, batch_size: int, out: "queue.Queue", stop: threading.Event):
+    """Stream one registered scraper onto the queue, batch_size signals at a time."""
+    try:
+        scraper: Scraper = SCRAPER_REGISTRY[name]()
+        signals = scraper.run()
+        for batch in iter(lambda: list(islice(signals, batch_size)), []):
+            if not _put(out, (name, batch, None), stop):
+                return
+    except Exception as e:
+        logger.error(f"Scraper {name} failed: {e}", exc_info=True)
+        _put(out, (name, None, e), stop)
+        return
+    _put(out, (name, None, None), stop)
+
+
+def iter_scraped_batches(sources: Optional[Iterable[str]] = None, batch_size: int = 500) -> Iterator[ScrapedBatch]:
+    """
+    Run scrapers concurrently (they are I/O bound, so threads overlap their
+    network waits) and yield their signals as they arrive:
+
+    - (name, batch, None) for each batch of up to batch_size signals
+    - (name, None, None) once a source is finished
+    - (name, None, error) if a source failed (unknown name, scraper error)
+
+    The queue is bounded, so at most a few batches per source are held in
+    memory and the consumer (enrichment, DB writes) runs while scraping
+    continues on the worker threads.
+
+    BaseScraper.run must stay thread-safe: scrapers only share loggers and
+    the read-only get_financial_engine() singleton.
+    """
+    names = list(SCRAPER_REGISTRY) if sources is None else list(sources)
+    if not names:
+        return
+
+    out: "queue.Queue[ScrapedBatch]" = queue.Queue(maxsize=2 * len(names))
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=len(names)) as ex:
+        for name in names:
+            ex.submit(_scrape_into, name, batch_size, out, stop)
+        try:
+            remaining = len(names)
+            while remaining:
+                item = out.get()
+                if item[1] is None:
+                    remaining -= 1
+                yield item
+        finally:
+            # Unblock workers if the consumer stops early
+            stop.set()
@@ -2,41 +2,89 @@
 Base Scraper Module.
 Defines the interface for all scrapers.
 """
+import json
 import logging
-from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import Iterator, List, Dict, Any, Protocol
 
-class BaseScraper(ABC):
+import pandas as pd
+
+from intelligence.keyword_index import match_keywords
+
+# json.dumps(..., default=str) builds a new encoder on every call; reuse one
+_RAW_DATA_ENCODER = json.JSONEncoder(default=str)
+
+class Scraper(Protocol):
+    """Structural type for scrapers (type-checking only)."""
+    
+    name: str
+    
+    def run(self) -> Iterator[Dict[str, Any]]: ...
+    
+    def scrape(self) -> Iterator[Dict[str, Any]]: ...
+
+
+class BaseScraper:
     """
-    Abstract base class for all scrapers.
+    Base class for all scrapers.
+    Subclasses implement scrape() and list their own attributes in __slots__.
     """
     
+    __slots__ = ("name", "base_url", "logger")
+    
+    # Columns of scrape_frame(), in order
+    SIGNAL_COLUMNS = [
+        "company_name", "signal_type", "source", "source_url", "description",
+        "raw_data", "product_match", "confidence", "sector", "discovered_at",
+    ]
+    
     def __init__(self, name: str, base_url: str):
         self.name = name
         self.base_url = base_url
         self.logger = logging.getLogger(f"scraper.{name}")
         
-    def run(self) -> List[Dict[str, Any]]:
+    def run(self) -> Iterator[Dict[str, Any]]:
         """
         Main execution method.
         Orchestrates scraping, processing, and error handling.
+        Yields items as they are scraped so consumers can start on them
+        before the scrape finishes.
         """
         self.logger.info(f"Starting {self.name} scrape...")
+        count = 0
         try:
-            results = self.scrape()
-            if results:
-                self.logger.info(f"Scraped {len(results)} items from {self.name}")
-            else:
-                self.logger.warning(f"No items scraped from {self.name}")
-            return results
+            for item in self.scrape():
+                count += 1
+                yield item
         except Exception as e:
             self.logger.error(f"Error running {self.name}: {e}", exc_info=True)
-            return []
+            return
+        if count:
+            self.logger.info(f"Scraped {count} items from {self.name}")
+        else:
+            self.logger.warning(f"No items scraped from {self.name}")
+    
+    def match_keywords(self, text: str) -> Dict[str, List[str]]:
+        """Match the configured KEYWORDS against text: {category: [keywords]}."""
+        return match_keywords(text)
+    
+    def scrape_frame(self) -> pd.DataFrame:
+        """
+        Run the scraper and return its signals column-wise, one column per
+        SIGNAL_COLUMNS entry (raw_data JSON-encoded), for vectorised
+        filtering and scoring downstream.
+        """
+        signals = list(self.run())
+        columns = {col: [signal.get(col) for signal in signals] for col in self.SIGNAL_COLUMNS}
+        columns["raw_data"] = [_RAW_DATA_ENCODER.encode(raw) for raw in columns["raw_data"]]
+        
+        df = pd.DataFrame(columns, columns=self.SIGNAL_COLUMNS)
+        df["confidence"] = df["confidence"].astype(float)
+        return df
 
-    @abstractmethod
-    def scrape(self) -> List[Dict[str, Any]]:
+    def scrape(self) -> Iterator[Dict[str, Any]]:
         """
         Implement the actual scraping logic here.
-        Must return a list of dictionaries representing the scraped data.
+        Must return an iterable (a list or a generator) of dictionaries
+        representing the scraped data.
         """
-        pass
+        raise NotImplementedError(f"{type(self).__name__} must implement scrape()")
@@ -4,26 +4,62 @@ Identifies new company registrations with high authorized capital.
 Sources (Simulated): Zauba Corp, Tofler.
 """
 import logging
-from typing import List, Dict, Any
+from typing import Iterator, Sequence, Tuple, Dict, Any
 from datetime import datetime, timedelta
 import random
 
+import numpy as np
+
 from scrapers.base_scraper import BaseScraper
-from intelligence.financial_inference import FinancialInferenceEngine
+from intelligence.financial_inference import get_financial_engine
 
 logger = logging.getLogger(__name__)
 
+# Realistic new company data (simulated for the hackathon), built once at import
+_SIMULATED_REGISTRATIONS = (
+    {
+        "company_name": "Solaris Polyesters Pvt Ltd",
+        "authorized_capital_cr": 50.0,
+        "date": "2026-01-15",
+        "url": "https://www.zaubacorp.com/company/SOLARIS-POLYESTERS",
+        "main_objects": "To carry on the business of manufacturing, processing, spinning, weaving, and dealing in polyester yarns, fabrics, and synthetic fibers."
+    },
+    {
+        "company_name": "GreenHorizon Agro Foods LLP",
+        "authorized_capital_cr": 5.0,
+        "date": "2026-01-20",
+        "url": "https://www.zaubacorp.com/company/GREENHORIZON",
+        "main_objects": "To set up cold storage facilities, food processing units, and deal in agricultural produce."
+    },
+    {
+        "company_name": "Apex Infra Developers Ltd",
+        "authorized_capital_cr": 25.0,
+        "date": "2026-01-25",
+        "url": "https://www.zaubacorp.com/company/APEX-INFRA",
+        "main_objects": "To carry on the business of infrastructure development, road construction, highway projects, and real estate development."
+    },
+    {
+        "company_name": "Rapid Tech Solutions Pvt Ltd",
+        "authorized_capital_cr": 0.1, # Low capital, should be ignored
+        "date": "2026-02-01",
+        "url": "https://www.zaubacorp.com/company/RAPID-TECH",
+        "main_objects": "To provide software development services and IT consulting."
+    },
+)
+
 class MCAScraper(BaseScraper):
     """
     Scrapes/Simulates data for New Company Registrations.
     Focus: High Authorized Capital (> 1 Crore) which implies industrial setup.
     """
     
+    __slots__ = ("financial_engine",)
+    
     def __init__(self):
         super().__init__("mca_registry", "https://www.mca.gov.in")
-        self.financial_engine = FinancialInferenceEngine()
+        self.financial_engine = get_financial_engine()
         
-    def scrape(self) -> List[Dict[str, Any]]:
+    def scrape(self) -> Iterator[Dict[str, Any]]:
         """
         Fetch new registrations.
         """
@@ -31,19 +67,22 @@ class MCAScraper(BaseScraper):
         simulated_registrations = self._get_simulated_registrations()
         return self.extract_signals(simulated_registrations)
 
-    def extract_signals(self, raw_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def extract_signals(self, raw_items: Sequence[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
         """Process raw registrations into intelligence signals."""
-        signals = []
+        count = 0
+        now = datetime.now()  # One discovery time for the whole batch
         
-        for item in raw_items:
-            # Filter: Only high capital companies (e.g., > 1 Cr)
-            if item["authorized_capital_cr"] < 1.0:
-                continue
-                
-            full_text = f"{item['company_name']} {item['main_objects']}"
-            
-            # Analyze Objects Clause
-            analysis = self.financial_engine.analyze_objects_clause(full_text, item["authorized_capital_cr"])
+        # Filter: Only high capital companies (e.g., > 1 Cr), one vectorised compare
+        capitals = np.fromiter(
+            (item["authorized_capital_cr"] for item in raw_items), dtype=np.float64, count=len(raw_items)
+        )
+        
+        for i in np.flatnonzero(capitals >= 1.0):
+            item = raw_items[i]
+            # Analyze Objects Clause (fields kept separate, no concatenation)
+            analysis = self.financial_engine.analyze_objects_clause(
+                item["main_objects"], item["authorized_capital_cr"], item["company_name"]
+            )
             
             if analysis["product_match"]:
                 signal = {
@@ -60,43 +99,14 @@ class MCAScraper(BaseScraper):
                     },
                     "product_match": analysis["product_match"],
                     "confidence": 75.0, # Good signal but early stage
-                    "discovered_at": datetime.now(),
+                    "discovered_at": now,
                     "sector": analysis["sector"],
                 }
-                signals.append(signal)
+                count += 1
+                yield signal
                 
-        self.logger.info(f"Extracted {len(signals)} signals from MCA Registrations")
-        return signals
+        self.logger.info(f"Extracted {count} signals from MCA Registrations")
 
-    def _get_simulated_registrations(self) -> List[Dict[str, Any]]:
-        """Generate realistic new company data."""
-        return [
-            {
-                "company_name": "Solaris Polyesters Pvt Ltd",
-                "authorized_capital_cr": 50.0,
-                "date": "2026-01-15",
-                "url": "https://www.zaubacorp.com/company/SOLARIS-POLYESTERS",
-                "main_objects": "To carry on the business of manufacturing, processing, spinning, weaving, and dealing in polyester yarns, fabrics, and synthetic fibers."
-            },
-            {
-                "company_name": "GreenHorizon Agro Foods LLP",
-                "authorized_capital_cr": 5.0,
-                "date": "2026-01-20",
-                "url": "https://www.zaubacorp.com/company/GREENHORIZON",
-                "main_objects": "To set up cold storage facilities, food processing units, and deal in agricultural produce."
-            },
-            {
-                "company_name": "Apex Infra Developers Ltd",
-                "authorized_capital_cr": 25.0,
-                "date": "2026-01-25",
-                "url": "https://www.zaubacorp.com/company/APEX-INFRA",
-                "main_objects": "To carry on the business of infrastructure development, road construction, highway projects, and real estate development."
-            },
-            {
-                "company_name": "Rapid Tech Solutions Pvt Ltd",
-                "authorized_capital_cr": 0.1, # Low capital, should be ignored
-                "date": "2026-02-01",
-                "url": "https://www.zaubacorp.com/company/RAPID-TECH",
-                "main_objects": "To provide software development services and IT consulting."
-            }
-        ]
+    def _get_simulated_registrations(self) -> Tuple[Dict[str, Any], ...]:
+        """Return the shared simulated fixtures (read-only, do not mutate)."""
+        return _SIMULATED_REGISTRATIONS
@@ -3,27 +3,61 @@ Rating Agency Scraper (CRISIL, ICRA, CARE).
 Extracts 'Rating Rationale' documents to identify loan purposes and capex plans.
 """
 import logging
-from typing import List, Dict, Any
+import re
+from typing import Iterable, Iterator, Tuple, Dict, Any
 from datetime import datetime
 import random
 
 from scrapers.base_scraper import BaseScraper
 from config.settings import SOURCES
-from intelligence.financial_inference import FinancialInferenceEngine
+from intelligence.financial_inference import get_financial_engine
 
 logger = logging.getLogger(__name__)
 
+# Realistic raw text from Rating Agencies (simulated), built once at import
+_SIMULATED_RATIONALES = (
+    {
+        "company": "Dilip Buildcon Ltd",
+        "agency": "CRISIL",
+        "url": "https://www.crisil.com/ratings/dilip-buildcon",
+        "rationale": "The rating factors in the upcoming loan for 4-laning of NH-44 highway project in Karnataka. The project involves road widening and bituminous concreting over 120 km."
+    },
+    {
+        "company": "Balrampur Chini Mills",
+        "agency": "ICRA",
+        "url": "https://www.icra.in/ratings/balrampur",
+        "rationale": "The rating upgrade reflects the capacity expansion of the sugar unit and the setting up of limits for the new distillery plant which will require molasses handling and steam generation."
+    },
+    {
+        "company": "Aarti Industries",
+        "agency": "CARE",
+        "url": "https://www.careratings.com/aarti",
+        "rationale": "The bank facilities are rated for the upcoming greenfield project in Gujarat. The chemical manufacturing unit calls for installation of new thermic fluid heaters and boilers."
+    },
+)
+
+# Sector keywords in priority order (first sector with a hit wins)
+SECTOR_KEYWORDS = [
+    ("road", "Infrastructure"), ("highway", "Infrastructure"),
+    ("sugar", "Agro-Processing"),
+    ("textile", "Textiles"), ("spinning", "Textiles"),
+    ("chemical", "Chemicals"),
+]
+_SECTOR_RE = re.compile("|".join(kw for kw, _ in SECTOR_KEYWORDS))
+
 class RatingScraper(BaseScraper):
     """
     Scrapes Credit Rating Agencies for 'Rating Rationale' documents.
     Key Sources: CRISIL, ICRA, CARE, India Ratings.
     """
     
+    __slots__ = ("financial_engine",)
+    
     def __init__(self):
         super().__init__("rating_agency", "https://www.crisil.com")
-        self.financial_engine = FinancialInferenceEngine()
+        self.financial_engine = get_financial_engine()
         
-    def scrape(self) -> List[Dict[str, Any]]:
+    def scrape(self) -> Iterator[Dict[str, Any]]:
         """
         Fetch rating rationales.
         For demo: returns high-fidelity simulated signals based on real patterns.
@@ -32,15 +66,14 @@ class RatingScraper(BaseScraper):
         simulated_rationales = self._get_simulated_rationales()
         return self.extract_signals(simulated_rationales)
 
-    def extract_signals(self, raw_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def extract_signals(self, raw_items: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
         """Process raw rating rationales into intelligence signals."""
-        signals = []
+        count = 0
+        now = datetime.now()  # One discovery time for the whole batch
         
         for item in raw_items:
-            full_text = f"{item['company']} {item['rationale']}"
-            
-            # Analyze using Financial Inference Engine
-            analysis = self.financial_engine.analyze_rating_rationale(full_text)
+            # Analyze using Financial Inference Engine (fields kept separate, no concatenation)
+            analysis = self.financial_engine.analyze_rating_rationale(item["rationale"], item["company"])
             
             if analysis["fuel_signals"]:
                 signal = {
@@ -57,41 +90,25 @@ class RatingScraper(BaseScraper):
                     },
                     "product_match": analysis["fuel_signals"][0]["product"] if analysis["fuel_signals"] else None,
                     "confidence": 85.0, # High confidence because banks verify this data
-                    "discovered_at": datetime.now(),
-                    "sector": self._infer_sector(full_text),
+                    "discovered_at": now,
+                    "sector": self._infer_sector(item["rationale"], item["company"]),
                 }
-                signals.append(signal)
+                count += 1
+                yield signal
                 
-        self.logger.info(f"Extracted {len(signals)} signals from Rating Rationales")
-        return signals
+        self.logger.info(f"Extracted {count} signals from Rating Rationales")
 
-    def _infer_sector(self, text: str) -> str:
-        text = text.lower()
-        if "road" in text or "highway" in text: return "Infrastructure"
-        if "sugar" in text: return "Agro-Processing"
-        if "textile" in text or "spinning" in text: return "Textiles"
-        if "chemical" in text: return "Chemicals"
+    def _infer_sector(self, rationale: str, company: str = "") -> str:
+        # One scan for all keywords, then pick by priority
+        found = set(_SECTOR_RE.findall(rationale.lower()))
+        if not found and company:
+            # Company name only disambiguates when the rationale names no sector
+            found = set(_SECTOR_RE.findall(company.lower()))
+        for keyword, sector in SECTOR_KEYWORDS:
+            if keyword in found:
+                return sector
         return "Industrial"
 
-    def _get_simulated_rationales(self) -> List[Dict[str, Any]]:
-        """Generate realistic raw text from Rating Agencies."""
-        return [
-            {
-                "company": "Dilip Buildcon Ltd",
-                "agency": "CRISIL",
-                "url": "https://www.crisil.com/ratings/dilip-buildcon",
-                "rationale": "The rating factors in the upcoming loan for 4-laning of NH-44 highway project in Karnataka. The project involves road widening and bituminous concreting over 120 km."
-            },
-            {
-                "company": "Balrampur Chini Mills",
-                "agency": "ICRA",
-                "url": "https://www.icra.in/ratings/balrampur",
-                "rationale": "The rating upgrade reflects the capacity expansion of the sugar unit and the setting up of limits for the new distillery plant which will require molasses handling and steam generation."
-            },
-            {
-                "company": "Aarti Industries",
-                "agency": "CARE",
-                "url": "https://www.careratings.com/aarti",
-                "rationale": "The bank facilities are rated for the upcoming greenfield project in Gujarat. The chemical manufacturing unit calls for installation of new thermic fluid heaters and boilers."
-            }
-        ]
+    def _get_simulated_rationales(self) -> Tuple[Dict[str, Any], ...]:
+        """Return the shared simulated fixtures (read-only, do not mutate)."""
+        return _SIMULATED_RATIONALES
@@ -2,11 +2,16 @@
 Seed database with sample data for demo purposes.
 """
 from datetime import datetime, timedelta
+from itertools import islice
 from models.database import get_db
 from models.lead import Lead, SignalType, LeadStatus
 
+# Leads enriched and inserted per chunk, keeps memory flat for large seeds
+SEED_BATCH_SIZE = 1000
+
 def seed():
     db = get_db()
+    now = datetime.now()
     try:
         # 1. High value signal from PARIVESH
         l1 = Lead(
@@ -15,7 +20,7 @@ def seed():
             signal_type=SignalType.EC_CLEARANCE,
             source_url="https://parivesh.nic.in/proposal/12345",
             raw_data={"description": "Proposal for 500MW Captive Power Plant expansion in Gujarat using imported coal and furnace oil."},
-            discovered_at=datetime.now(),
+            discovered_at=now,
             score=95.0,
             status=LeadStatus.NEW,
             keywords_matched={"industrial_machinery": ["Captive Power Plant", "Furnace"], "commodities": ["Furnace Oil"]},
@@ -30,7 +35,7 @@ def seed():
             signal_type=SignalType.TENDER,
             source_url="https://eprocure.gov.in/eprocure/app?tender=56789",
             raw_data={"description": "Notice Inviting Tender for supply of VG-30 Bitumen for NH-44 resurfacing project."},
-            discovered_at=datetime.now() - timedelta(hours=4),
+            discovered_at=now - timedelta(hours=4),
             score=88.5,
             status=LeadStatus.NEW,
             keywords_matched={"commodities": ["VG-30", "Bitumen"], "regulatory_events": ["Notice Inviting Tender"]},
@@ -45,7 +50,7 @@ def seed():
             signal_type=SignalType.EXPANSION,
             source_url="https://bseindia.com/xml-data/corpfiling/Attach/999.pdf",
             raw_data={"description": "Board approves setting up new manufacturing facility at Dahej with 200KL capacity."},
-            discovered_at=datetime.now() - timedelta(days=1),
+            discovered_at=now - timedelta(days=1),
             score=78.0,
             status=LeadStatus.CONTACTED,
             keywords_matched={"regulatory_events": ["Greenfield Project"], "industrial_machinery": ["Boiler"]},
@@ -54,13 +59,15 @@ def seed():
         )
         
         
-        from intelligence.pipeline import IntelligencePipeline
-        pipeline = IntelligencePipeline()
+        from intelligence.pipeline import get_pipeline
+        pipeline = get_pipeline()
         
         leads = [l1, l2, l3]
-        processed_leads = [pipeline.process_lead(l.to_dict()) for l in leads]
+        lead_dicts = (l.to_dict() for l in leads)
         
-        db.insert_leads_batch(processed_leads)
+        # One process_batch + executemany per chunk
+        for chunk in iter(lambda: list(islice(lead_dicts, SEED_BATCH_SIZE)), []):
+            db.insert_leads_batch(pipeline.process_batch(chunk))
         print("Seeded 3 valid leads with advanced intelligence.")
     except Exception as e:
         print(f"Error seeding database: {e}")
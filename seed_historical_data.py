@@ -4,14 +4,95 @@ Generates realistic leads based on actual market patterns for 2025-2026.
 """
 import sys
 import random
-from datetime import datetime, timedelta
+from collections import Counter
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from string import Formatter
 
-sys.path.append(str(__file__).rsplit('\\', 1)[0])
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 from models.database import get_db
-from intelligence.pipeline import IntelligencePipeline
+from intelligence.pipeline import get_pipeline
+from intelligence.keyword_index import match_keywords
+
+# Leads enriched and inserted per chunk, keeps memory flat for large seeds
+SEED_BATCH_SIZE = 1000
+
+# Agencies a Credit Rating Rationale lead is attributed to
+RATING_AGENCIES = ("CRISIL", "ICRA", "CARE")
+
+# Number of synthetic leads generated per run
+HISTORICAL_LEAD_COUNT = 120
+
+# Template placeholder -> key of the template's pool of values
+FIELD_POOLS = {
+    "amount": "amounts",
+    "facility": "facilities",
+    "product": "products",
+    "purpose": "purposes",
+    "quantity": "quantities",
+    "item": "items",
+    "project": "projects",
+    "facility_type": "facility_types",
+    "capex": "capex_amounts",
+    "capacity_pct": "capacity_pcts",
+    "rationale_type": "rationale_types",
+    "project_type": "project_types",
+    "capital": "capitals",
+    "objects": "objects_list",
+}
+
+# Pools used when a template does not define its own
+FIELD_DEFAULTS = {
+    "capex": ["500"],
+    "capacity_pct": ["20"],
+}
+
 
-def generate_historical_leads():
-    """Generate 100+ realistic leads from Jan 2025 to Feb 2026."""
+def draw_template_fields(template, k, rand=random):
+    """
+    Pre-draw k values for every pooled placeholder in the template's desc,
+    one rand.choices call per pool. Returns {field: iterator of values}.
+    """
+    # Ordered (not a set) so the draw order, and thus seeded output, is stable
+    fields = dict.fromkeys(name for _, name, _, _ in Formatter().parse(template["desc"]) if name in FIELD_POOLS)
+    return {
+        field: iter(rand.choices(template.get(FIELD_POOLS[field], FIELD_DEFAULTS.get(field)), k=k))
+        for field in fields
+    }
+
+
+class TemplateFields(dict):
+    """
+    Placeholder values for one lead, for str.format_map.
+    Pooled fields take the next pre-drawn value (see draw_template_fields)
+    the first time they are used; {specific_needs} follows the
+    {project_type} that was drawn.
+    """
+    
+    def __init__(self, template, draws, **fixed):
+        super().__init__(fixed)
+        self.template = template
+        self.draws = draws
+    
+    def __missing__(self, field):
+        if field == "specific_needs":
+            value = self.template["specific_needs_map"].get(self["project_type"], "")
+        else:
+            value = next(self.draws[field])
+        self[field] = value
+        return value
+
+def generate_historical_leads(seed=None):
+    """
+    Generate 100+ realistic leads from Jan 2025 to Feb 2026.
+    Template, company, location and date are drawn up front in one NumPy
+    batch, and placeholder values, agencies and URL ids from a random.Random;
+    both are seeded from seed, so pass it for a reproducible draw.
+    """
     
     # Real company names from Indian industrial sector
     companies = [
@@ -30,6 +111,7 @@ def generate_historical_leads():
     signal_templates = [
         {
             "type": "Capacity Expansion",
+            "source": "BSE",
             "desc": "Board approves {amount} Crore expansion project for new {facility} at {location}",
             "facilities": ["manufacturing unit", "steel plant", "cement plant", "power plant", "chemical facility", "Paint manufacturing unit", "Jute processing mill"],
             "amounts": ["500", "750", "1200", "2500", "5000"],
@@ -37,6 +119,7 @@ def generate_historical_leads():
         },
         {
             "type": "Government Tender",
+            "source": "GeM",
             "desc": "NIT for supply of {product} for {purpose} - {quantity}",
             "products": ["VG-30 Bitumen", "HSD (Diesel)", "Furnace Oil", "Lubricants", "Mineral Turpentine Oil", "Jute Batching Oil"],
             "purposes": ["road construction", "power generation", "industrial use", "equipment operation", "paint production", "textile processing"],
@@ -44,12 +127,14 @@ def generate_historical_leads():
         },
         {
             "type": "PSU Procurement",
+            "source": "GeM",
             "desc": "Procurement of {item} for {project}",
             "items": ["500 KVA DG Sets", "Industrial Boilers", "Captive Power Plant equipment", "HSD Storage Tanks", "Steel Wash Oil"],
             "projects": ["new facility", "maintenance operations", "backup power", "expansion project", "cleaning operations"],
         },
         {
             "type": "Financial Announcement",
+            "source": "BSE",
             "desc": "Board approves {capex} Crore CAPEX for {capacity_pct}% capacity expansion in {facility}",
             "capex_amounts": ["250", "500", "1000", "1500", "3000"],
             "capacity_pcts": ["15", "20", "25", "30", "40"],
@@ -57,6 +142,7 @@ def generate_historical_leads():
         },
         {
             "type": "Credit Rating Rationale",
+            "source": None,  # Drawn per lead from RATING_AGENCIES
             "desc": "The rating factors in the {rationale_type} for the {project_type} at {location}. {specific_needs}",
             "rationale_types": ["upcoming loan", "term loan facility", "bank facilities rated", "proposed NCDs"],
             "project_types": ["greenfield project", "road widening project", "capacity expansion of the sugar unit", "new textile unit"],
@@ -69,6 +155,7 @@ def generate_historical_leads():
         },
         {
             "type": "New Company Registration",
+            "source": "MCA",
             "desc": "New Registration: {company} with ₹{capital} Cr Capital. Objects: {objects}",
             "capitals": ["5.0", "10.0", "25.0", "50.0", "100.0"],
             "objects_list": [
@@ -86,107 +173,76 @@ def generate_historical_leads():
         "Haryana", "Punjab", "Madhya Pradesh", "Chhattisgarh", "Andhra Pradesh"
     ]
     
-    leads = []
-    
     # Generate leads spread across 2025-early 2026
     start_date = datetime(2025, 1, 1)
     end_date = datetime(2026, 2, 8)
     date_range = (end_date - start_date).days
+    current_year = datetime.now().year
     
-    for i in range(120):  # Generate 120 leads
+    # Per-lead picks for every lead at once
+    rng = np.random.default_rng(seed)
+    rand = random.Random(seed)
+    n = HISTORICAL_LEAD_COUNT
+    template_idx = rng.integers(0, len(signal_templates), size=n).tolist()
+    company_idx = rng.integers(0, len(companies), size=n).tolist()
+    location_idx = rng.integers(0, len(locations), size=n).tolist()
+    day_offsets = rng.integers(0, date_range + 1, size=n)
+    
+    # Discovery dates in one vectorised add; tolist() yields datetime objects
+    discovered_dates = (np.datetime64(start_date, "us") + day_offsets.astype("timedelta64[D]")).tolist()
+    
+    # Placeholder values and rating agencies, drawn in bulk per template pool
+    template_counts = Counter(template_idx)
+    field_draws = {t: draw_template_fields(signal_templates[t], k, rand) for t, k in template_counts.items()}
+    agency_draws = iter(rand.choices(RATING_AGENCIES, k=n))
+    
+    # Sized once up front, filled in place
+    leads = [None] * n
+    
+    for i in range(n):
         # Select template
-        template = random.choice(signal_templates)
-        company = random.choice(companies)
-        location = random.choice(locations)
+        template = signal_templates[template_idx[i]]
+        company = companies[company_idx[i]]
+        location = locations[location_idx[i]]
         
-        # Generate description
-        desc = template["desc"]
-        if "{amount}" in desc:
-            desc = desc.replace("{amount}", random.choice(template["amounts"]))
-        if "{facility}" in desc:
-            desc = desc.replace("{facility}", random.choice(template["facilities"]))
-        if "{location}" in desc:
-            desc = desc.replace("{location}", location)
-        if "{product}" in desc:
-            desc = desc.replace("{product}", random.choice(template["products"]))
-        if "{purpose}" in desc:
-            desc = desc.replace("{purpose}", random.choice(template["purposes"]))
-        if "{quantity}" in desc:
-            desc = desc.replace("{quantity}", random.choice(template["quantities"]))
-        if "{item}" in desc:
-            desc = desc.replace("{item}", random.choice(template["items"]))
-        if "{project}" in desc:
-            desc = desc.replace("{project}", random.choice(template["projects"]))
-        if "{facility_type}" in desc:
-            desc = desc.replace("{facility_type}", random.choice(template["facility_types"]))
-        if "{capex}" in desc:
-            desc = desc.replace("{capex}", random.choice(template.get("capex_amounts", ["500"])))
-        if "{capacity_pct}" in desc:
-            desc = desc.replace("{capacity_pct}", random.choice(template.get("capacity_pcts", ["20"])))
-        if "{rationale_type}" in desc:
-            desc = desc.replace("{rationale_type}", random.choice(template["rationale_types"]))
-        if "{project_type}" in desc:
-            ptype = random.choice(template["project_types"])
-            desc = desc.replace("{project_type}", ptype)
-            if "{specific_needs}" in desc:
-                needs = template["specific_needs_map"].get(ptype, "")
-                desc = desc.replace("{specific_needs}", needs)
-        if "{capital}" in desc:
-            desc = desc.replace("{capital}", random.choice(template["capitals"]))
-        if "{objects}" in desc:
-            desc = desc.replace("{objects}", random.choice(template["objects_list"]))
+        # Generate description: one pass over the template
+        fields = TemplateFields(template, field_draws[template_idx[i]], company=company, location=location)
+        desc = template["desc"].format_map(fields)
         
         # Random date in range
-        days_offset = random.randint(0, date_range)
-        discovered_at = start_date + timedelta(days=days_offset)
-        
-        # Match keywords in description
-        from config.settings import KEYWORDS
-        keywords_matched = {}
-        desc_lower = desc.lower()
+        discovered_at = discovered_dates[i]
         
-        for category, keyword_list in KEYWORDS.items():
-            matches = []
-            for keyword in keyword_list:
-                if keyword.lower() in desc_lower:
-                    matches.append(keyword)
-            if matches:
-                keywords_matched[category] = matches
+        # Match keywords in description (one scan for all categories)
+        keywords_matched = match_keywords(desc)
         
-        # Determine Source and URL
-        source = "Unknown"
+        # Source is fixed per template (rating agencies are drawn per lead); URL follows it
+        source = template["source"] or next(agency_draws)
         url = ""
         
-        if template["type"] in ["Capacity Expansion", "Financial Announcement"]:
-            source = "BSE"
-            scrip_code = random.randint(500000, 599999)
+        if source == "BSE":
+            scrip_code = rand.randint(500000, 599999)
             url = f"https://www.bseindia.com/xml-data/corpfiling/AttachLive/{scrip_code}_{i}.pdf"
             
-        elif template["type"] in ["Government Tender", "PSU Procurement"]:
-            source = "GeM"
-            bid_id = f"GEM/{datetime.now().year}/B/{random.randint(1000000, 9999999)}"
+        elif source == "GeM":
+            bid_id = f"GEM/{current_year}/B/{rand.randint(1000000, 9999999)}"
             url = f"https://market.gem.gov.in/ra/bids/{bid_id}"
             
-        elif template["type"] == "Environmental Clearance":
-            source = "PARIVESH"
-            proposal_id = f"IA/{location[:2].upper()}/{random.choice(['IND', 'INFRA'])}/{random.randint(10000, 99999)}/2025"
+        elif source == "PARIVESH":
+            proposal_id = f"IA/{location[:2].upper()}/{rand.choice(['IND', 'INFRA'])}/{rand.randint(10000, 99999)}/2025"
             url = f"https://parivesh.nic.in/proposal_details.php?pid={proposal_id}"
             
-        elif template["type"] == "Credit Rating Rationale":
-            agency = random.choice(["CRISIL", "ICRA", "CARE"])
-            source = agency
+        elif source == "MCA":
+            cin = f"U{rand.randint(10000, 99999)}{location[:2].upper()}{current_year}PTC{rand.randint(100000, 999999)}"
+            url = f"https://www.zaubacorp.com/company/{company.replace(' ', '-')}/{cin}"
+            
+        elif source in RATING_AGENCIES:
             slug = company.lower().replace(" ", "-").replace(".", "")
-            if agency == "CRISIL":
-                url = f"https://www.crisil.com/mnt/winshare/Ratings/RatingList/RatingDocs/{slug}_{random.randint(1000,9999)}.html"
-            elif agency == "ICRA":
-                url = f"https://www.icra.in/Rationale/ShowRationaleReport/?Id={random.randint(10000, 99999)}"
+            if source == "CRISIL":
+                url = f"https://www.crisil.com/mnt/winshare/Ratings/RatingList/RatingDocs/{slug}_{rand.randint(1000,9999)}.html"
+            elif source == "ICRA":
+                url = f"https://www.icra.in/Rationale/ShowRationaleReport/?Id={rand.randint(10000, 99999)}"
             else:
                 url = f"https://www.careratings.com/upload/CompanyFiles/PR/{slug}.pdf"
-                
-        elif template["type"] == "New Company Registration":
-            source = "MCA"
-            cin = f"U{random.randint(10000, 99999)}{location[:2].upper()}{datetime.now().year}PTC{random.randint(100000, 999999)}"
-            url = f"https://www.zaubacorp.com/company/{company.replace(' ', '-')}/{cin}"
 
         lead = {
             "company_name": company,
@@ -200,7 +256,7 @@ def generate_historical_leads():
             "sector": "Industrial",
         }
         
-        leads.append(lead)
+        leads[i] = lead
     
     return leads
 
@@ -211,23 +267,25 @@ def seed_historical_data():
     print("=" * 80)
     
     db = get_db()
-    pipeline = IntelligencePipeline()
+    pipeline = get_pipeline()
     
     leads = generate_historical_leads()
     print(f"\nGenerating {len(leads)} historical leads...")
     
-    # Process through intelligence pipeline
-    processed = []
-    for lead in leads:
-        enriched = pipeline.process_lead(lead)
-        processed.append(enriched)
-    
-    # Filter confidence > 30
-    high_quality = [l for l in processed if l.get("confidence", 0) >= 30]
-    print(f"High-confidence leads (>30%): {len(high_quality)}")
-    
-    # Insert to database
-    result = db.insert_leads_batch(processed)
+    # Process through intelligence pipeline and insert a chunk at a time
+    pending = iter(leads)
+    high_quality = 0
+    result = {"inserted": 0, "duplicates": 0}
+    for chunk in iter(lambda: list(islice(pending, SEED_BATCH_SIZE)), []):
+        processed = pipeline.process_batch(chunk)
+        
+        # Count confidence > 30
+        high_quality += sum(1 for l in processed if l.get("confidence", 0) >= 30)
+        
+        counts = db.insert_leads_batch(processed)
+        result["inserted"] += counts["inserted"]
+        result["duplicates"] += counts["duplicates"]
+    print(f"High-confidence leads (>30%): {high_quality}")
     
     print(f"\n✓ Inserted: {result['inserted']} leads")
     print(f"  Duplicates: {result['duplicates']}")
@@ -13,11 +13,8 @@ def create_test_dataset():
     """Create a small test dataset from first 10 rows"""
     print("Creating test dataset from first 10 rows...")
     
-    # Read full dataset
-    df_full = pd.read_csv("data/filtered_dataset.csv")
-    
-    # Take first 10 rows
-    df_test = df_full.head(10).copy()
+    # Read only the first 10 rows
+    df_test = pd.read_csv("data/filtered_dataset.csv", nrows=10)
     
     # Save test dataset
     test_path = Path("data/test_filtered_dataset.csv")
@@ -41,8 +38,7 @@ def test_officer_mapping():
     # Initialize mapper with test dataset
     mapper = OfficerMapper(dataset_path=str(test_path))
     
-    # Load and map
-    mapper.load_dataset()
+    # Map
     mapper.map_officers_to_dataset(save_path="data/test_with_officers.csv")
     
     # Validate
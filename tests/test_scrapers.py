@@ -19,9 +19,11 @@ from scrapers.base_scraper import BaseScraper
 
 class TestIntelligence(unittest.TestCase):
     
-    def setUp(self):
-        self.scorer = LeadScorer()
-        self.mapper = ProductMapper()
+    @classmethod
+    def setUpClass(cls):
+        # Built once for the class; the tests only read from them
+        cls.scorer = LeadScorer()
+        cls.mapper = ProductMapper()
     
     def test_lead_scoring(self):
         """Test lead scoring logic."""
@@ -82,6 +84,17 @@ class TestBaseScraper(unittest.TestCase):
         self.assertIn("VG-30", matches["commodities"])
         self.assertIn("Bitumen", matches["commodities"])
         self.assertIn("Supply of", matches["regulatory_events"])
+    
+    def test_scrape_frame(self):
+        """Test column-wise scraper output."""
+        from scrapers.mca_scraper import MCAScraper
+        
+        df = MCAScraper().scrape_frame()
+        
+        self.assertEqual(list(df.columns), BaseScraper.SIGNAL_COLUMNS)
+        self.assertEqual(len(df), 3)  # The low-capital registration is dropped
+        self.assertTrue((df["confidence"] == 75.0).all())
+        self.assertIn("authorized_capital_cr", df["raw_data"].iloc[0])
 
 
 if __name__ == '__main__':
@@ -5,16 +5,28 @@ import json
 def verify_csv():
     print("Verifying leads_export.csv for Credit Rating Signals...")
     try:
+        # One streaming pass: count each signal type, keep only the rows we print
+        cr_count = ncr_count = 0
+        rows, ncr_rows = [], []
         with open('data/leads_export.csv', 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            all_rows = list(reader)
+            reader = csv.reader(f)
+            header = next(reader)
+            type_idx = header.index('signal_type')
             
-        rows = [r for r in all_rows if r['signal_type'] == 'Credit Rating Rationale']
-        ncr_rows = [r for r in all_rows if r['signal_type'] == 'New Company Registration']
+            for row in reader:
+                signal_type = row[type_idx]
+                if signal_type == 'Credit Rating Rationale':
+                    cr_count += 1
+                    if len(rows) < 3:
+                        rows.append(dict(zip(header, row)))
+                elif signal_type == 'New Company Registration':
+                    ncr_count += 1
+                    if len(ncr_rows) < 3:
+                        ncr_rows.append(dict(zip(header, row)))
             
-        print(f"Found {len(rows)} Credit Rating Rationale leads.")
+        print(f"Found {cr_count} Credit Rating Rationale leads.")
         
-        for i, r in enumerate(rows[:3], 1):
+        for i, r in enumerate(rows, 1):
             print(f"\nLead {i}: {r['company_name']}")
             print(f"  Signal: {r['signal_type']}")
             raw = json.loads(r['raw_data'])
@@ -30,9 +42,9 @@ def verify_csv():
             print(f"  Mapped Product: {r['product_match']}")
             
         # Verify New Company Registrations
-        print(f"\nFound {len(ncr_rows)} New Company Registration leads.")
+        print(f"\nFound {ncr_count} New Company Registration leads.")
         
-        for i, r in enumerate(ncr_rows[:3], 1):
+        for i, r in enumerate(ncr_rows, 1):
             print(f"\nLead {i}: {r['company_name']}")
             print(f"  Signal: {r['signal_type']}")
             raw = json.loads(r['raw_data'])